@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+
+from users.cache import shared_cache
+
+
+@register()
+def check_token_user_cache(app_configs, **kwargs):
+    """
+    Версия токенов в режиме JWT_TOKEN_USER и пользователи при
+    USER_CACHE_TIMEOUT хранятся в кэше: сброс при смене роли, отключении
+    или удалении должен быть виден всем процессам сервера, поэтому кэш
+    в памяти одного процесса не подходит.
+    """
+    if shared_cache():
+        return []
+    backend = settings.CACHES['default']['BACKEND']
+    return [
+        Error(
+            f'{setting} требует общего для всех процессов кэша.',
+            hint=(
+                'Укажите в CACHES Redis, Memcached или DatabaseCache: с '
+                f'{backend} смена роли, отключение или удаление '
+                'пользователя видны только процессу, который их сохранил.'
+            ),
+            id='api.E001',
+        )
+        for setting, enabled in (
+            ('JWT_TOKEN_USER', settings.JWT_TOKEN_USER),
+            ('USER_CACHE_TIMEOUT', settings.USER_CACHE_TIMEOUT > 0),
+        )
+        if enabled
+    ]
+
+
+@register()
+def check_throttle_cache(app_configs, **kwargs):
+    """
+    Счётчики AUTH_THROTTLE_RATES хранятся в кэше: с кэшем в памяти
+    процесса каждый процесс сервера считает запросы сам, и лимит
+    фактически умножается на число процессов.
+    """
+    if shared_cache() or not settings.AUTH_THROTTLE_RATES:
+        return []
+    return [Warning(
+        'AUTH_THROTTLE_RATES считаются отдельно в каждом процессе.',
+        hint=(
+            'Укажите в CACHES Redis, Memcached или DatabaseCache: с '
+            f'{settings.CACHES["default"]["BACKEND"]} лимиты регистрации '
+            'и получения токена действуют в каждом процессе сервера '
+            'отдельно.'
+        ),
+        id='api.W001',
+    )]
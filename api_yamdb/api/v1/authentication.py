@@ -0,0 +1,175 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.cache import cache_user, get_cached_user, get_token_version
+from users.models import User
+
+ROLE_CLAIM = 'role'
+SUPERUSER_CLAIM = 'is_superuser'
+TOKEN_VERSION_CLAIM = 'token_version'
+
+
+def access_token_for(user):
+    """Токен доступа с ролью, флагом суперпользователя и версией токенов."""
+    token = AccessToken.for_user(user)
+    token[ROLE_CLAIM] = user.role
+    token[SUPERUSER_CLAIM] = user.is_superuser
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+    return token
+
+
+class RoleTokenUser(TokenUser):
+    """
+    Пользователь, собранный из подписанных в токене полей: роли и флага
+    суперпользователя хватает для проверки прав без запроса к базе.
+    """
+
+    @cached_property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    @property
+    def is_moderator(self):
+        return self.role == User.MODERATOR
+
+    @property
+    def is_admin(self):
+        return self.role == User.ADMIN or self.is_superuser
+
+
+def current_user(request):
+    """
+    Пользователь запроса как объект модели: нужен там, где пользователь
+    сохраняется в базу, например автором отзыва.
+    """
+    if isinstance(request.user, User):
+        return request.user
+    user = get_cached_user(request.user.id)
+    if user is None:
+        user = User.objects.get(pk=request.user.id)
+        cache_user(user)
+    return user
+
+
+class TokenCache:
+    """
+    LRU-кэш проверенных токенов в памяти процесса: ключ — sha256 строки
+    токена, значение хранится до его exp. Повторный запрос с тем же
+    токеном не декодирует base64 и не проверяет подпись заново.
+    Считает попадания, промахи и время, потраченное на проверку.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.tokens = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.validate_seconds = 0.0
+
+    @staticmethod
+    def key(raw_token):
+        if isinstance(raw_token, str):
+            raw_token = raw_token.encode()
+        return hashlib.sha256(raw_token).digest()
+
+    def get(self, key):
+        with self.lock:
+            cached = self.tokens.get(key)
+            if cached is not None and cached[1] > time.time():
+                self.tokens.move_to_end(key)
+                self.hits += 1
+                return cached[0]
+            if cached is not None:
+                del self.tokens[key]
+            self.misses += 1
+        return None
+
+    def validate(self, raw_token, validate):
+        """Токен из кэша или результат validate(raw_token)."""
+        key = self.key(raw_token)
+        token = self.get(key)
+        if token is not None:
+            return token
+        start = time.perf_counter()
+        token = validate(raw_token)
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.validate_seconds += elapsed
+            if self.size and 'exp' in token:
+                self.tokens[key] = (token, token['exp'])
+                while len(self.tokens) > self.size:
+                    self.tokens.popitem(last=False)
+        return token
+
+    def clear(self):
+        with self.lock:
+            self.tokens.clear()
+            self.hits = self.misses = 0
+            self.validate_seconds = 0.0
+
+    def stats(self):
+        """Размер, доля попаданий и сэкономленное на проверке время."""
+        requests = self.hits + self.misses
+        average = self.validate_seconds / self.misses if self.misses else 0
+        return {
+            'size': len(self.tokens),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / requests, 3) if requests else None,
+            'saved_seconds': round(self.hits * average, 3),
+        }
+
+
+token_cache = TokenCache(settings.JWT_TOKEN_CACHE_SIZE)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без запроса пользователя к базе на каждый запрос:
+    при общем кэше пользователь берётся из него по user_id токена
+    и хранится там USER_CACHE_TIMEOUT секунд или до сохранения либо
+    удаления (см. users.cache). В кэш попадают только активные
+    пользователи, прошедшие проверки JWTAuthentication.get_user.
+
+    При JWT_TOKEN_USER пользователем запроса становится TOKEN_USER_CLASS
+    из полей токена, выданного access_token_for: токен принимается, пока
+    его версия совпадает с token_version пользователя в кэше.
+
+    Проверенные токены хранятся в token_cache до истечения срока.
+    """
+
+    def get_validated_token(self, raw_token):
+        return token_cache.validate(raw_token, super().get_validated_token)
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        if settings.JWT_TOKEN_USER and (
+            TOKEN_VERSION_CLAIM in validated_token
+        ):
+            return self.get_token_user(user_id, validated_token)
+        user = get_cached_user(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache_user(user)
+        return user
+
+    def get_token_user(self, user_id, validated_token):
+        if validated_token[TOKEN_VERSION_CLAIM] != get_token_version(user_id):
+            raise AuthenticationFailed(
+                'Токен отозван: права пользователя изменились.',
+                code='token_revoked'
+            )
+        return api_settings.TOKEN_USER_CLASS(validated_token)
@@ -0,0 +1,74 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+from reviews.versions import INVALIDATIONS_COUNTER
+
+CACHE_PREFIX = 'catalogue'
+HITS_COUNTER = f'{CACHE_PREFIX}:stats:hits'
+MISSES_COUNTER = f'{CACHE_PREFIX}:stats:misses'
+
+
+def request_fingerprint(request, versions, *extra):
+    """
+    Отпечаток запроса на чтение: адрес, отсортированные параметры
+    запроса и версии коллекций, от которых зависит ответ.
+    """
+    params = sorted(
+        (name, sorted(values))
+        for name, values in request.query_params.lists()
+    )
+    marker = [
+        (key, version) for key, (version, _) in sorted(versions.items())
+    ]
+    url = request.build_absolute_uri(request.path)
+    raw = json.dumps([url, params, marker, *extra])
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def response_cache_key(request, versions):
+    fingerprint = request_fingerprint(request, versions)
+    return f'{CACHE_PREFIX}:response:{fingerprint}'
+
+
+def response_validators(request, versions):
+    """
+    Сильный ETag и время последнего изменения ответа, вычисленные
+    по версиям коллекций без выполнения запроса и сериализации.
+    """
+    etag = '"{}"'.format(request_fingerprint(
+        request, versions, request.accepted_renderer.format
+    ))
+    modified = [
+        modified for _, modified in versions.values() if modified is not None
+    ]
+    last_modified = int(max(modified).timestamp()) if modified else None
+    return etag, last_modified
+
+
+def get_cached_data(key):
+    data = cache.get(key)
+    count_event(MISSES_COUNTER if data is None else HITS_COUNTER)
+    return data
+
+
+def set_cached_data(key, data):
+    cache.set(key, data, settings.CATALOGUE_CACHE_TIMEOUT)
+
+
+def count_event(counter):
+    cache.add(counter, 0, timeout=None)
+    cache.incr(counter)
+
+
+def cache_stats():
+    counters = cache.get_many(
+        [HITS_COUNTER, MISSES_COUNTER, INVALIDATIONS_COUNTER]
+    )
+    return {
+        'hits': counters.get(HITS_COUNTER, 0),
+        'misses': counters.get(MISSES_COUNTER, 0),
+        'invalidations': counters.get(INVALIDATIONS_COUNTER, 0),
+    }
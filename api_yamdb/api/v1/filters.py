@@ -1,21 +1,78 @@
+from django.db.models import Count
 from django_filters import rest_framework as filters
 
-from reviews.models import Title
+from reviews.models import Category, Genre, Title
+from reviews.search import search_titles
+
+
+MATCH_ANY = 'any'
+MATCH_ALL = 'all'
+
+
+def split_slugs(value):
+    return list(dict.fromkeys(
+        slug for slug in (part.strip() for part in value.split(',')) if slug
+    ))
 
 
 class TitlesFilter(filters.FilterSet):
+    """
+    Фильтры `genre` и `category` принимают slug или список slug через
+    запятую и сравнивают их точно: slug один раз переводятся в id,
+    а произведения отбираются по индексированным внешним ключам.
+    `genre_match=all` оставляет произведения со всеми жанрами списка.
+    Поиск подстроки — `genre__icontains` и `category__icontains`.
+    """
     name = filters.CharFilter(
         field_name='name',
         lookup_expr='icontains'
     )
-    category = filters.CharFilter(
+    category = filters.CharFilter(method='filter_category')
+    genre = filters.CharFilter(method='filter_genre')
+    genre_match = filters.ChoiceFilter(
+        choices=((MATCH_ANY, MATCH_ANY), (MATCH_ALL, MATCH_ALL)),
+        method='filter_genre_match'
+    )
+    category__icontains = filters.CharFilter(
         field_name='category__slug',
         lookup_expr='icontains'
     )
-    genre = filters.CharFilter(
+    genre__icontains = filters.CharFilter(
         field_name='genre__slug',
         lookup_expr='icontains'
     )
+    search = filters.CharFilter(method='filter_search')
+
+    def filter_category(self, queryset, name, value):
+        category_ids = list(Category.objects.filter(
+            slug__in=split_slugs(value)
+        ).values_list('id', flat=True))
+        if not category_ids:
+            return queryset.none()
+        return queryset.filter(category_id__in=category_ids)
+
+    def filter_genre(self, queryset, name, value):
+        slugs = split_slugs(value)
+        genre_ids = list(Genre.objects.filter(
+            slug__in=slugs
+        ).values_list('id', flat=True))
+        match_all = self.form.cleaned_data.get('genre_match') == MATCH_ALL
+        if not genre_ids or (match_all and len(genre_ids) < len(slugs)):
+            return queryset.none()
+        title_ids = Title.genre.through.objects.filter(
+            genre_id__in=genre_ids
+        ).values('title_id')
+        if match_all and len(genre_ids) > 1:
+            title_ids = title_ids.annotate(
+                matched=Count('genre_id')
+            ).filter(matched=len(genre_ids)).values('title_id')
+        return queryset.filter(id__in=title_ids)
+
+    def filter_genre_match(self, queryset, name, value):
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
 
     class Meta:
         model = Title
@@ -1,5 +1,11 @@
-from rest_framework import mixins, viewsets, filters
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import mixins, viewsets, filters, status
+from rest_framework.response import Response
 
+from reviews.versions import CATALOGUE, get_versions
+from .cache import (get_cached_data, response_cache_key, response_validators,
+                    set_cached_data)
 from .permissions import IsAdminOrReadOnly
 
 
@@ -13,3 +19,63 @@ class ListCreateDestroyViewSet(
     lookup_field = 'slug'
     filter_backends = [filters.SearchFilter]
     search_fields = ('name',)
+
+
+class VersionedResponseMixin:
+    """
+    Ответы на чтение, зависящие от версий коллекций из get_version_keys:
+    условные GET по ETag и Last-Modified, а при cache_responses ещё и
+    кэширование данных ответа до изменения этих коллекций.
+    """
+    cache_responses = False
+
+    def get_version_keys(self):
+        raise NotImplementedError(
+            'Укажите коллекции, от которых зависит ответ.'
+        )
+
+    def get_versioned_response(self, handler, request, *args, **kwargs):
+        versions = get_versions([CATALOGUE, *self.get_version_keys()])
+        etag, last_modified = response_validators(request, versions)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = self.get_fresh_response(
+                versions, handler, request, *args, **kwargs
+            )
+        if response.status_code in (status.HTTP_200_OK,
+                                    status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def get_fresh_response(self, versions, handler, request, *args,
+                           **kwargs):
+        if not self.cache_responses:
+            return handler(request, *args, **kwargs)
+        key = response_cache_key(request, versions)
+        data = get_cached_data(key)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            set_cached_data(key, response.data)
+        return response
+
+
+class VersionedListMixin(VersionedResponseMixin):
+
+    def list(self, request, *args, **kwargs):
+        return self.get_versioned_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class VersionedRetrieveMixin(VersionedResponseMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_versioned_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,165 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework import exceptions
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Курсорная пагинация по ключу сортировки: страница выбирается
+    условием по полям последней записи, без OFFSET и COUNT.
+    Последнее поле в ordering должно быть уникальным. Параметры
+    ranked_query_params задают свой порядок выдачи (релевантность
+    поиска), который курсор по ordering потерял бы: с ними курсорный
+    режим отвечает 400.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    ordering = ('id',)
+    ranked_query_params = ()
+    invalid_cursor_message = 'Некорректный курсор.'
+    ranked_query_message = (
+        'Курсорная пагинация не сочетается с параметром {param}: '
+        'его результаты упорядочены по релевантности.'
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        for param in self.ranked_query_params:
+            if param in request.query_params:
+                raise exceptions.ValidationError({self.cursor_query_param: [
+                    self.ranked_query_message.format(param=param)
+                ]})
+        self.base_url = request.build_absolute_uri()
+        position, reverse = self.decode_cursor(request, queryset.model)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(f'-{field}' for field in ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                self.keyset_filter(self.ordering, position, reverse)
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            has_next, has_previous = position is not None, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+        self.next_position = self.previous_position = None
+        if results and has_next:
+            self.next_position = self.get_position(results[-1])
+        if results and has_previous:
+            self.previous_position = self.get_position(results[0])
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_link(self.next_position, reverse=False),
+            'previous': self.get_link(self.previous_position, reverse=True),
+            'results': data,
+        })
+
+    def keyset_filter(self, fields, values, reverse):
+        """
+        Условие «ключ строки после позиции» в виде, пригодном для
+        поиска по составному индексу: a >= x AND (a > x OR b > y).
+        """
+        lookup = 'lt' if reverse else 'gt'
+        field, value = fields[0], values[0]
+        if len(fields) == 1:
+            return Q(**{f'{field}__{lookup}': value})
+        return Q(**{f'{field}__{lookup}e': value}) & (
+            Q(**{f'{field}__{lookup}': value})
+            | Q(**{field: value})
+            & self.keyset_filter(fields[1:], values[1:], reverse)
+        )
+
+    def get_position(self, instance):
+        return [getattr(instance, field) for field in self.ordering]
+
+    def get_link(self, position, reverse):
+        if position is None:
+            return None
+        values = [
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in position
+        ]
+        data = {'p': values, 'r': int(reverse)}
+        cursor = base64.urlsafe_b64encode(
+            json.dumps(data).encode('utf-8')
+        ).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, cursor
+        )
+
+    def decode_cursor(self, request, model):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            data = json.loads(
+                base64.urlsafe_b64decode(cursor.encode('ascii'))
+            )
+            values = data['p']
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+            return position, bool(data.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeError,
+                binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class OptionalKeysetPagination(PageNumberPagination):
+    """
+    Постраничная пагинация с курсорным режимом по запросу:
+    наличие параметра cursor (в том числе пустого) включает
+    keyset_class вместо номеров страниц.
+    """
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TitlesKeysetPagination(KeysetPagination):
+    ordering = ('name', 'id')
+    ranked_query_params = ('search',)
+
+
+class TitlesPagination(OptionalKeysetPagination):
+    keyset_class = TitlesKeysetPagination
+
+
+class PubDateKeysetPagination(KeysetPagination):
+    ordering = ('pub_date', 'id')
+
+
+class PubDatePagination(OptionalKeysetPagination):
+    keyset_class = PubDateKeysetPagination
@@ -5,7 +5,8 @@ from django.shortcuts import get_object_or_404
 from django.conf import settings
 
 from users.models import User
-from reviews.models import Title, Genre, Category, Comment, Review
+from reviews.models import (Title, Genre, Category, Comment, Review,
+                            ImportJob)
 from .validators import me_forbidden
 
 
@@ -81,7 +82,7 @@ class CreateUpdateTitleSerializer(serializers.ModelSerializer):
     rating = serializers.IntegerField(read_only=True)
 
     def to_representation(self, instance):
-        serializer = ShowTitlesSerializer(instance)
+        serializer = ShowTitlesSerializer(instance, context=self.context)
         return serializer.data
 
     class Meta:
@@ -97,6 +98,44 @@ class CreateUpdateTitleSerializer(serializers.ModelSerializer):
         )
 
 
+class RatingDistributionSerializer(serializers.ModelSerializer):
+    """Сериализатор распределения оценок произведения."""
+    count = serializers.IntegerField(source='review_count')
+    mean = serializers.SerializerMethodField()
+    distribution = serializers.SerializerMethodField()
+
+    def get_mean(self, obj):
+        if not obj.review_count:
+            return None
+        return round(obj.score_sum / obj.review_count, 2)
+
+    def get_distribution(self, obj):
+        counts = {
+            counter.score: counter.count
+            for counter in obj.score_counts.all()
+        }
+        return {
+            str(score): counts.get(score, 0)
+            for score in range(settings.MIN_SCORE, settings.MAX_SCORE + 1)
+        }
+
+    class Meta:
+        model = Title
+        fields = ('count', 'mean', 'distribution')
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Сериализатор состояния загрузки CSV."""
+
+    class Meta:
+        model = ImportJob
+        fields = (
+            'id', 'status', 'rows', 'rejected', 'rows_per_second', 'tables',
+            'error', 'created', 'started', 'finished'
+        )
+        read_only_fields = fields
+
+
 class ReviewSerializer(serializers.ModelSerializer):
     """Сериализатор для запросов к отзывам."""
     author = serializers.SlugRelatedField(
@@ -110,7 +149,7 @@ class ReviewSerializer(serializers.ModelSerializer):
             title_id = request.parser_context['kwargs'].get('title_id')
             title = get_object_or_404(Title, pk=title_id)
             if Review.objects.filter(
-                title=title, author=request.user
+                title=title, author_id=request.user.id
             ).exists():
                 raise ValidationError(
                     'Вы уже оставили отзыв на это произведение!'
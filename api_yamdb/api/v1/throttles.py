@@ -0,0 +1,102 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+from .cache import count_event
+
+CACHE_PREFIX = 'throttle'
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+
+def parse_rate(rate):
+    """'20/min' -> (число запросов, длина окна в секундах)."""
+    limit, period = rate.split('/')
+    return int(limit), PERIODS[period[0]]
+
+
+def counter_key(scope, kind, event):
+    return f'{CACHE_PREFIX}:stats:{scope}:{kind}:{event}'
+
+
+def hit(key, period):
+    """
+    Атомарно увеличивает счётчик окна: add создаёт его, только если
+    ключа нет, а incr в общем кэше не теряет параллельные запросы.
+    """
+    cache.add(key, 0, period)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Счётчик истёк между add и incr.
+        cache.add(key, 0, period)
+        return cache.incr(key)
+
+
+class WindowThrottle(BaseThrottle):
+    """
+    Счётчик запросов в фиксированном окне в общем кэше: на каждый
+    запрос — add и incr без чтения и записи состояния, поэтому
+    параллельные запросы не проходят сверх лимита. Лимит берётся
+    из AUTH_THROTTLE_RATES по throttle_scope view и виду ключа kind.
+    Ключ окна истекает вместе с ним и не копится в кэше. На стыке
+    окон можно успеть сделать до двух лимитов запросов подряд.
+    """
+    kind = None
+
+    def get_key(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        rate = settings.AUTH_THROTTLE_RATES.get(scope, {}).get(self.kind)
+        ident = self.get_key(request)
+        if rate is None or ident is None:
+            return True
+        limit, period = parse_rate(rate)
+        now = time.time()
+        window = int(now // period)
+        digest = hashlib.md5(str(ident).encode('utf-8')).hexdigest()
+        key = f'{CACHE_PREFIX}:{scope}:{self.kind}:{digest}:{window}'
+        allowed = hit(key, period) <= limit
+        self.wait_seconds = 0 if allowed else (window + 1) * period - now
+        event = 'allowed' if allowed else 'throttled'
+        count_event(counter_key(scope, self.kind, event))
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPWindowThrottle(WindowThrottle):
+    kind = 'ip'
+
+    def get_key(self, request):
+        return self.get_ident(request)
+
+
+class UsernameWindowThrottle(WindowThrottle):
+    kind = 'username'
+
+    def get_key(self, request):
+        username = request.data.get('username')
+        return username if isinstance(username, str) and username else None
+
+
+def throttle_stats():
+    """Число пропущенных и отклонённых запросов по лимитам."""
+    keys = {
+        (scope, kind, event): counter_key(scope, kind, event)
+        for scope, rates in settings.AUTH_THROTTLE_RATES.items()
+        for kind in rates
+        for event in ('allowed', 'throttled')
+    }
+    counters = cache.get_many(keys.values())
+    stats = {}
+    for (scope, kind, event), key in keys.items():
+        stats.setdefault(scope, {}).setdefault(kind, {})[event] = (
+            counters.get(key, 0)
+        )
+    return stats
@@ -2,13 +2,15 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (UserViewSet, CategoriesViewSet, GenresViewSet, APIGetToken,
-                    APISignUp, TitlesViewSet, ReviewViewSet, CommentViewSet)
+                    APISignUp, TitlesViewSet, ReviewViewSet, CommentViewSet,
+                    APIStats, ImportJobViewSet)
 
 v1_router = DefaultRouter()
 v1_router.register('users', UserViewSet, basename='users')
 v1_router.register('categories', CategoriesViewSet, basename='categories')
 v1_router.register('genres', GenresViewSet, basename='genres')
 v1_router.register('titles', TitlesViewSet, basename='titles')
+v1_router.register('imports', ImportJobViewSet, basename='imports')
 v1_router.register(r'titles/(?P<title_id>\d+)/reviews',
                    ReviewViewSet, basename='reviews')
 v1_router.register(r'titles/(?P<title_id>\d+)/reviews/(?P<review_id>\d+)'
@@ -21,5 +23,6 @@ auth_urls = [
 
 urlpatterns = [
     path('auth/', include(auth_urls)),
+    path('stats/', APIStats.as_view(), name='stats'),
     path('', include(v1_router.urls)),
 ]
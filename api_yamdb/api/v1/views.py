@@ -1,30 +1,41 @@
-from django.db.models import Avg
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.conf import settings
-from rest_framework import viewsets, status
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import transaction
+from rest_framework import mixins, viewsets, status
 from rest_framework.filters import SearchFilter
 from rest_framework.decorators import action
 from rest_framework.permissions import (IsAuthenticatedOrReadOnly,
                                         IsAuthenticated, AllowAny)
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 
-from reviews.models import Title, Genre, Category, Review
+from reviews.importers import TABLES
+from reviews.jobs import save_upload, upload_extension
+from reviews.models import Title, Genre, Category, Review, ImportJob
+from reviews.versions import (CATEGORIES, GENRES, TITLES, comments_key,
+                              reviews_key, title_key)
 from users.models import User
+from users.outbox import enqueue_email, outbox_stats
 from .serializers import (ReviewSerializer, CommentSerializer,
                           UserSerializer, ShowTitlesSerializer,
                           GetTokenSerializer, SignUpSerializer,
                           CategoriesSerializer, CreateUpdateTitleSerializer,
-                          GenresSerializer, UserPatchSerializer)
-from .mixins import ListCreateDestroyViewSet
+                          GenresSerializer, UserPatchSerializer,
+                          RatingDistributionSerializer, ImportJobSerializer)
+from .authentication import access_token_for, current_user
+from .cache import cache_stats
+from .mixins import (VersionedListMixin, VersionedRetrieveMixin,
+                     ListCreateDestroyViewSet)
 from .permissions import (IsAdmin, IsAdminOrReadOnly,
                           IsAdminModeratorOwnerOrReadOnly)
 from .filters import TitlesFilter
+from .pagination import PubDatePagination, TitlesPagination
+from .throttles import (IPWindowThrottle, UsernameWindowThrottle,
+                        throttle_stats)
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -46,8 +57,7 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=(IsAuthenticated,),
     )
     def me(self, request):
-        user = get_object_or_404(User,
-                                 username=request.user.username)
+        user = current_user(request)
         if request.method == 'GET':
             serializer = UserSerializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -61,46 +71,56 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(VersionedListMixin, VersionedRetrieveMixin,
+                    viewsets.ModelViewSet):
     """
     View отвечающий за работу c отзывами к произведениям.
     """
     serializer_class = ReviewSerializer
-    pagination_class = PageNumberPagination
+    pagination_class = PubDatePagination
     permission_classes = (IsAdminModeratorOwnerOrReadOnly,)
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_queryset(self):
         title = get_object_or_404(Title, pk=self.kwargs['title_id'])
-        return title.reviews.all()
+        return title.reviews.select_related('author')
+
+    def get_version_keys(self):
+        return [reviews_key(int(self.kwargs['title_id']))]
 
     def perform_create(self, serializer):
         title = get_object_or_404(Title, pk=self.kwargs['title_id'])
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=current_user(self.request), title=title)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(VersionedListMixin, VersionedRetrieveMixin,
+                     viewsets.ModelViewSet):
     """
     View отвечающий за работу c комментариями к отзывам.
     """
     serializer_class = CommentSerializer
-    pagination_class = PageNumberPagination
+    pagination_class = PubDatePagination
     permission_classes = (IsAdminModeratorOwnerOrReadOnly,)
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_queryset(self):
         review = get_object_or_404(Review, pk=self.kwargs['review_id'])
-        return review.comments.all()
+        return review.comments.select_related('author')
+
+    def get_version_keys(self):
+        return [comments_key(int(self.kwargs['review_id']))]
 
     def perform_create(self, serializer):
         title_id = self.kwargs['title_id']
         review_id = self.kwargs['review_id']
         review = get_object_or_404(Review, id=review_id, title=title_id)
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=current_user(self.request), review=review)
 
 
 class APISignUp(APIView):
     permission_classes = (AllowAny,)
+    throttle_classes = (IPWindowThrottle, UsernameWindowThrottle)
+    throttle_scope = 'signup'
 
     def post(self, request):
         serializer = SignUpSerializer(data=request.data)
@@ -118,17 +138,18 @@ class APISignUp(APIView):
             email=email
         )
         confirmation_code = default_token_generator.make_token(user)
-        send_mail(
+        enqueue_email(
             subject='Код потверждения для YaMdb',
             message=f'Ваш код подтверждения: {confirmation_code}',
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email]
+            recipient=user.email
         )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class APIGetToken(APIView):
     permission_classes = (AllowAny,)
+    throttle_classes = (IPWindowThrottle, UsernameWindowThrottle)
+    throttle_scope = 'token'
 
     def post(self, request):
         data = request.data
@@ -141,40 +162,145 @@ class APIGetToken(APIView):
         ):
             return Response(serializer.errors,
                             status=status.HTTP_400_BAD_REQUEST)
-        token = AccessToken.for_user(user)
+        token = access_token_for(user)
         return Response({'token': str(token)},
                         status=status.HTTP_200_OK)
 
 
-class CategoriesViewSet(ListCreateDestroyViewSet):
+class APIStats(APIView):
+    """
+    View со счётчиками внутренних кэшей, очереди писем и ограничения
+    частоты запросов для администраторов.
+    """
+    permission_classes = (IsAdmin,)
+
+    def get(self, request):
+        return Response(
+            {
+                'catalogue_cache': cache_stats(),
+                'email_outbox': outbox_stats(),
+                'throttling': throttle_stats(),
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class ImportJobViewSet(mixins.CreateModelMixin, mixins.ListModelMixin,
+                       mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    View загрузки CSV администраторами: файлы таблиц принимаются сразу
+    на диск, задачи по очереди выполняет `manage.py runimportjob --loop`,
+    а по id задачи можно следить за числом обработанных и отклонённых
+    строк и скоростью.
+    """
+    queryset = ImportJob.objects.all()
+    serializer_class = ImportJobSerializer
+    permission_classes = (IsAdmin,)
+    parser_classes = (MultiPartParser,)
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [TemporaryFileUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def check_uploads(self, files):
+        tables = {table.name for table in TABLES}
+        errors = {}
+        if not files:
+            errors['files'] = ['Приложите хотя бы один файл таблицы.']
+        for table, upload in files.items():
+            if table not in tables:
+                errors[table] = [
+                    f'Неизвестная таблица. Доступны: '
+                    f'{", ".join(sorted(tables))}.'
+                ]
+            elif upload_extension(upload.name) is None:
+                errors[table] = ['Поддерживаются файлы CSV и JSON Lines.']
+        return errors
+
+    def create(self, request, *args, **kwargs):
+        errors = self.check_uploads(request.FILES)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        # Обработчик очереди увидит задачу только после записи файлов.
+        with transaction.atomic():
+            job = ImportJob.objects.create(author=current_user(request))
+            for table, upload in request.FILES.items():
+                save_upload(job.pk, table, upload)
+        return Response(
+            self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED
+        )
+
+
+class CategoriesViewSet(VersionedListMixin, ListCreateDestroyViewSet):
     """
     View отвечающий за работу c категориями прoизведений.
     """
     queryset = Category.objects.all()
     serializer_class = CategoriesSerializer
+    cache_responses = True
 
+    def get_version_keys(self):
+        return [CATEGORIES]
 
-class GenresViewSet(ListCreateDestroyViewSet):
+
+class GenresViewSet(VersionedListMixin, ListCreateDestroyViewSet):
     """
     View отвечающий за работу c жанрами произведений.
     """
     queryset = Genre.objects.all()
     serializer_class = GenresSerializer
+    cache_responses = True
+
+    def get_version_keys(self):
+        return [GENRES]
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
+class TitlesViewSet(VersionedListMixin, VersionedRetrieveMixin,
+                    viewsets.ModelViewSet):
     """
     View отвечающий за определенное произведение к которому пойдут отзывы.
     """
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')).all().order_by('name')
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('name')
     permission_classes = (IsAdminOrReadOnly,)
+    pagination_class = TitlesPagination
+    lookup_value_regex = r'\d+'
     filter_backends = [DjangoFilterBackend]
     filterset_class = TitlesFilter
     http_method_names = ['get', 'post', 'patch', 'delete']
+    cache_responses = True
 
     def get_serializer_class(self):
         """Переопределяем сериализатор"""
         if self.action in ['list', 'retrieve']:
             return ShowTitlesSerializer
         return CreateUpdateTitleSerializer
+
+    def get_version_keys(self):
+        if self.action == 'rating_distribution':
+            return [title_key(int(self.kwargs['pk']))]
+        if self.action == 'retrieve':
+            return [title_key(int(self.kwargs['pk'])), GENRES, CATEGORIES]
+        return [TITLES, GENRES, CATEGORIES]
+
+    @action(
+        detail=True,
+        methods=['get'],
+        url_path='rating-distribution',
+    )
+    def rating_distribution(self, request, pk=None):
+        """Распределение оценок по счётчикам, без чтения отзывов."""
+        return self.get_versioned_response(
+            self.get_rating_distribution, request, pk=pk
+        )
+
+    def get_rating_distribution(self, request, pk=None):
+        title = get_object_or_404(
+            Title.objects.only('score_sum', 'review_count').prefetch_related(
+                'score_counts'
+            ),
+            pk=pk
+        )
+        serializer = RatingDistributionSerializer(title)
+        return Response(serializer.data, status=status.HTTP_200_OK)
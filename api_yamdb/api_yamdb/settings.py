@@ -76,6 +76,23 @@ DATABASES = {
 }
 
 
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+CATALOGUE_CACHE_TIMEOUT = 60 * 15
+
+# Кэш пользователей для аутентификации; включается только вместе с общим
+# для всех процессов кэшем в CACHES (проверка api.E001).
+USER_CACHE_TIMEOUT = 0
+
+JWT_TOKEN_CACHE_SIZE = 10000
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -126,6 +143,22 @@ NAME_SYM_LIMIT = 254
 
 EMAIL_SYM_LIMIT = 254
 
+MIN_SCORE = 1
+
+MAX_SCORE = 10
+
+IMPORT_JOBS_ROOT = os.path.join(BASE_DIR, 'import_jobs')
+
+IMPORT_JOBS_RETENTION = timedelta(days=7)
+
+OUTBOX_BATCH_SIZE = 100
+
+OUTBOX_MAX_ATTEMPTS = 5
+
+OUTBOX_RETRY_DELAY = 60
+
+OUTBOX_CLAIM_TIMEOUT = 60 * 5
+
 
 # REST
 
@@ -134,7 +167,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.v1.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS':
         'rest_framework.pagination.PageNumberPagination',
@@ -164,7 +197,7 @@ SIMPLE_JWT = {
 
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
-    'TOKEN_USER_CLASS': 'rest_framework_simplejwt.models.TokenUser',
+    'TOKEN_USER_CLASS': 'api.v1.authentication.RoleTokenUser',
 
     'JTI_CLAIM': 'jti',
 
@@ -173,6 +206,21 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
 
+# Права проверяются по роли из токена, без загрузки пользователя.
+# Версия токенов для их отзыва хранится в кэше, поэтому режим требует
+# общего для всех процессов кэша (проверка api.E001).
+JWT_TOKEN_USER = False
+
+TOKEN_VERSION_CACHE_TIMEOUT = 60 * 5
+
+# Лимиты запросов в окне для регистрации и получения токена: по IP
+# и по username из запроса. Счётчики хранятся в кэше, поэтому лимиты
+# общие для процессов сервера только при общем кэше (проверка api.W001).
+AUTH_THROTTLE_RATES = {
+    'signup': {'ip': '20/min', 'username': '5/min'},
+    'token': {'ip': '30/min', 'username': '10/min'},
+}
+
 
 # EMAIL
 
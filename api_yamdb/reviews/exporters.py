@@ -0,0 +1,89 @@
+import csv
+import gzip
+import json
+import os
+from datetime import datetime
+
+from django.db import connection
+
+from .importers import TABLES
+
+CSV = 'csv'
+JSONL = 'jsonl'
+FORMATS = (CSV, JSONL)
+CHUNK_SIZE = 2000
+
+
+def export_path(data_path, table, fmt, compress=True):
+    extension = f'.{fmt}.gz' if compress else f'.{fmt}'
+    return os.path.join(data_path, f'{table.name}{extension}')
+
+
+def open_target(path, compress=True):
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def table_rows(table, db=connection):
+    """
+    Строки таблицы в порядке первичного ключа. iterator() читает их
+    курсором частями по CHUNK_SIZE, не загружая таблицу в память.
+    """
+    attnames = [
+        table.model._meta.get_field(column).attname
+        for column in table.columns
+    ]
+    queryset = table.model.objects.using(db.alias).order_by(
+        'pk'
+    ).values_list(*attnames)
+    for row in queryset.iterator(chunk_size=CHUNK_SIZE):
+        yield [export_value(value) for value in row]
+
+
+def export_table(table, path, fmt=CSV, compress=True, db=connection):
+    """
+    Выгружает таблицу в файл CSV или JSON Lines с колонками table.columns,
+    который читает importcsv. Возвращает число строк.
+    """
+    exported = 0
+    with open_target(path, compress) as file:
+        if fmt == CSV:
+            writer = csv.writer(file)
+            writer.writerow(table.columns)
+            for row in table_rows(table, db):
+                writer.writerow(['' if value is None else value
+                                 for value in row])
+                exported += 1
+        else:
+            for row in table_rows(table, db):
+                file.write(json.dumps(
+                    dict(zip(table.columns, row)), ensure_ascii=False
+                ))
+                file.write('\n')
+                exported += 1
+    return exported
+
+
+def export_tables(data_path, fmt=CSV, compress=True, tables=None,
+                  progress=None, db=connection):
+    """
+    Выгружает таблицы каталога в data_path. progress(таблица, строк, путь)
+    вызывается после каждой таблицы. Возвращает {таблица: число строк}.
+    """
+    os.makedirs(data_path, exist_ok=True)
+    exported = {}
+    for table in TABLES:
+        if tables and table.name not in tables:
+            continue
+        path = export_path(data_path, table, fmt, compress)
+        exported[table.name] = export_table(table, path, fmt, compress, db)
+        if progress is not None:
+            progress(table.name, exported[table.name], path)
+    return exported
@@ -0,0 +1,194 @@
+import csv
+import math
+import os
+import random
+from datetime import datetime, timezone
+from itertools import islice
+
+from .exporters import CHUNK_SIZE, CSV, export_path, open_target
+from .importers import TABLES
+
+WORDS = (
+    'сюжет', 'герой', 'финал', 'музыка', 'атмосфера', 'актёры', 'диалоги',
+    'книга', 'фильм', 'режиссёр', 'сцена', 'глава', 'история', 'мир',
+    'отличный', 'скучный', 'неожиданный', 'сильный', 'слабый', 'яркий',
+    'затянутый', 'смешной', 'грустный', 'честный', 'очень', 'совсем',
+    'почти', 'местами', 'снова', 'впервые', 'понравился', 'удивил',
+)
+ROLES = ('user',) * 98 + ('moderator', 'admin')
+TEXTS = 4096
+START_DATE = datetime(2000, 1, 1, tzinfo=timezone.utc).timestamp()
+DATE_RANGE = 23 * 365 * 24 * 3600
+COMMENT_DELAY = 30 * 24 * 3600
+# Годы выпуска не зависят от текущей даты: иначе тот же seed давал бы
+# другие файлы после смены года.
+MIN_YEAR = 1900
+MAX_YEAR = 2023
+
+
+def pick(rng, size):
+    """Случайное число от 1 до size: один вызов random() дешевле randint."""
+    return int(rng.random() * size) + 1
+
+
+def text(rng, min_words=3, max_words=12):
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    return ' '.join(words).capitalize() + '.'
+
+
+def date(rng, start=START_DATE, seconds=DATE_RANGE):
+    return round(start + rng.random() * seconds, 3)
+
+
+def isoformat(timestamp):
+    return datetime.fromtimestamp(
+        timestamp, timezone.utc
+    ).isoformat(timespec='milliseconds')
+
+
+def poisson(rng, mean):
+    """Число событий по распределению Пуассона (алгоритм Кнута)."""
+    if mean <= 0:
+        return 0
+    limit = math.exp(-mean)
+    count = 0
+    product = rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+def zipf_counts(total, items, exponent, limit):
+    """
+    Раскладывает total отзывов по items произведениям по закону Ципфа:
+    произведение ранга r получает долю, пропорциональную 1 / r^exponent,
+    но не больше limit. Отдаёт числа по рангам, не храня их списком.
+    """
+    norm = sum(1 / rank ** exponent for rank in range(1, items + 1))
+    scale = total / norm
+    expected = 0.0
+    emitted = 0
+    for rank in range(1, items + 1):
+        expected += scale / rank ** exponent
+        count = min(int(expected) - emitted, limit)
+        emitted += count
+        yield count
+
+
+def permutation_step(rng, size):
+    """
+    Шаг, взаимно простой с size: rank * step % size перебирает все
+    произведения без хранения перестановки в памяти.
+    """
+    if size == 1:
+        return 1
+    while True:
+        step = rng.randrange(1, size)
+        if math.gcd(step, size) == 1:
+            return step
+
+
+def table_path(path, name, compress):
+    table = next(table for table in TABLES if table.name == name)
+    return table, export_path(path, table, CSV, compress)
+
+
+def write_table(path, name, rows, compress):
+    """Пишет строки пачками по CHUNK_SIZE. Возвращает их число."""
+    table, target = table_path(path, name, compress)
+    written = 0
+    with open_target(target, compress) as file:
+        writer = csv.writer(file)
+        writer.writerow(table.columns)
+        while True:
+            chunk = list(islice(rows, CHUNK_SIZE))
+            if not chunk:
+                return written
+            writer.writerows(chunk)
+            written += len(chunk)
+
+
+def generate_dataset(path, users=1000, titles=1000, genres=15, categories=3,
+                     reviews_per_title=10.0, zipf=1.1, comments_per_review=1.0,
+                     seed=0, compress=False, max_year=MAX_YEAR):
+    """
+    Пишет в path CSV-файлы всех таблиц в формате importcsv. Данные
+    полностью определяются seed; строки порождаются генераторами
+    и пишутся потоком, поэтому память не зависит от объёма.
+    Возвращает {таблица: число строк}.
+    """
+    os.makedirs(path, exist_ok=True)
+    rng = random.Random(seed)
+    counts = {}
+    counts['users'] = write_table(path, 'users', (
+        (idx, f'user{idx}', f'user{idx}@yamdb.fake', rng.choice(ROLES),
+         '', '', '')
+        for idx in range(1, users + 1)
+    ), compress)
+    counts['category'] = write_table(path, 'category', (
+        (idx, f'Категория {idx}', f'category-{idx}')
+        for idx in range(1, categories + 1)
+    ), compress)
+    counts['genre'] = write_table(path, 'genre', (
+        (idx, f'Жанр {idx}', f'genre-{idx}')
+        for idx in range(1, genres + 1)
+    ), compress)
+    counts['titles'] = write_table(path, 'titles', (
+        (idx, f'{text(rng, 1, 4)[:-1]} {idx}', rng.randint(MIN_YEAR, max_year),
+         rng.randint(1, categories), text(rng) if rng.random() < 0.5 else '')
+        for idx in range(1, titles + 1)
+    ), compress)
+    counts['genre_title'] = write_table(path, 'genre_title', (
+        (title_id * 3 + offset, title_id, genre_id)
+        for title_id in range(1, titles + 1)
+        for offset, genre_id in enumerate(
+            rng.sample(range(1, genres + 1), min(genres, rng.randint(1, 3)))
+        )
+    ), compress)
+    counts.update(write_reviews(
+        path, rng, users, titles, reviews_per_title, zipf,
+        comments_per_review, compress
+    ))
+    return counts
+
+
+def write_reviews(path, rng, users, titles, reviews_per_title, zipf,
+                  comments_per_review, compress):
+    """
+    Отзывы и комментарии пишутся за один проход: комментарии к отзыву
+    порождаются сразу после него. У произведения авторы отзывов разные.
+    Тексты берутся из заранее составленного набора TEXTS.
+    """
+    step = permutation_step(rng, titles)
+    texts = [text(rng) for _ in range(TEXTS)]
+    counts = {'review': 0, 'comments': 0}
+    review_table, review_path = table_path(path, 'review', compress)
+    comment_table, comment_path = table_path(path, 'comments', compress)
+    with open_target(review_path, compress) as reviews_file, \
+            open_target(comment_path, compress) as comments_file:
+        reviews = csv.writer(reviews_file)
+        comments = csv.writer(comments_file)
+        reviews.writerow(review_table.columns)
+        comments.writerow(comment_table.columns)
+        ranks = zipf_counts(
+            round(titles * reviews_per_title), titles, zipf, users
+        )
+        for rank, count in enumerate(ranks):
+            title_id = rank * step % titles + 1
+            for author in rng.sample(range(1, users + 1), count):
+                counts['review'] += 1
+                review_id = counts['review']
+                published = date(rng)
+                reviews.writerow((
+                    review_id, title_id, texts[pick(rng, TEXTS) - 1], author,
+                    pick(rng, 10), isoformat(published)
+                ))
+                for _ in range(poisson(rng, comments_per_review)):
+                    counts['comments'] += 1
+                    comments.writerow((
+                        counts['comments'], review_id,
+                        texts[pick(rng, TEXTS) - 1], pick(rng, users),
+                        isoformat(date(rng, published, COMMENT_DELAY))
+                    ))
+    return counts
@@ -0,0 +1,748 @@
+import csv
+import gzip
+import io
+import json
+import os
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+from pathlib import Path
+
+import django
+from django.core.management.color import no_style
+from django.db import IntegrityError, connection, models, transaction
+from django.utils import timezone
+
+from users.models import User
+from .models import Category, Comment, Genre, Review, Title
+from .ratings import rebuild_title_scores
+from .versions import CATALOGUE, bump_versions
+
+BATCH_SIZE = 5000
+CHUNK_BYTES = 4 * 1024 * 1024
+# Размер запроса проверки ссылок, если СУБД не ограничивает число
+# параметров запроса.
+LINKS_BATCH_SIZE = 10000
+
+Table = namedtuple('Table', ('name', 'model', 'columns'))
+Chunk = namedtuple('Chunk', ('table', 'header', 'path', 'start', 'end'))
+
+# Порядок загрузки учитывает внешние ключи между таблицами, columns —
+# колонки файлов выгрузки в формате static/data.
+TABLES = (
+    Table('users', User, (
+        'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+    )),
+    Table('category', Category, ('id', 'name', 'slug')),
+    Table('genre', Genre, ('id', 'name', 'slug')),
+    Table('titles', Title, (
+        'id', 'name', 'year', 'category', 'description'
+    )),
+    Table('genre_title', Title.genre.through, ('id', 'title_id', 'genre_id')),
+    Table('review', Review, (
+        'id', 'title_id', 'text', 'author', 'score', 'pub_date'
+    )),
+    Table('comments', Comment, (
+        'id', 'review_id', 'text', 'author', 'pub_date'
+    )),
+)
+
+SQLITE_FAST_LOAD = {
+    'synchronous': 'OFF',
+    'journal_mode': 'MEMORY',
+    'temp_store': 'MEMORY',
+    'cache_size': -256000,
+}
+
+
+@contextmanager
+def fast_load(db=connection):
+    """
+    На время загрузки отключает в SQLite синхронную запись на диск
+    и держит журнал и временные данные в памяти. Прежние значения
+    прагм восстанавливаются после загрузки.
+    """
+    if db.vendor != 'sqlite':
+        yield
+        return
+    previous = {}
+    with db.cursor() as cursor:
+        for pragma, value in SQLITE_FAST_LOAD.items():
+            cursor.execute(f'PRAGMA {pragma}')
+            previous[pragma] = cursor.fetchone()[0]
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+    try:
+        yield
+    finally:
+        with db.cursor() as cursor:
+            for pragma, value in previous.items():
+                cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+class RowConverter:
+    """
+    Переводит строку CSV в значения колонок таблицы модели. Колонки CSV
+    сопоставляются полям по имени или attname (`category`, `title_id`),
+    отсутствующие в CSV поля получают значения по умолчанию.
+    """
+
+    def __init__(self, model, header, db=connection):
+        self.db = db
+        self.fields = model._meta.concrete_fields
+        columns = {
+            model._meta.get_field(column).attname: index
+            for index, column in enumerate(header)
+        }
+        self.columns = [columns.get(field.attname) for field in self.fields]
+
+    def defaults(self):
+        now = timezone.now()
+        return [
+            now if isinstance(field, models.DateTimeField) and (
+                field.auto_now or field.auto_now_add
+            ) else field.get_default()
+            for field in self.fields
+        ]
+
+    def prepare(self, field, value):
+        if value == '' and field.null:
+            return None
+        return field.get_db_prep_save(field.to_python(value), self.db)
+
+    def __call__(self, rows):
+        defaults = [
+            self.prepare(field, value)
+            for field, value in zip(self.fields, self.defaults())
+        ]
+        return [
+            tuple(
+                default if column is None else self.prepare(field, row[column])
+                for field, column, default in zip(
+                    self.fields, self.columns, defaults
+                )
+            )
+            for row in rows
+        ]
+
+
+def insert_sql(model, db=connection):
+    """
+    Многострочная вставка с пропуском строк, чей первичный ключ уже
+    есть в таблице: повторный импорт того же файла ничего не меняет.
+    Нарушение других ограничений уникальности даёт IntegrityError,
+    а не пропускает строку молча, как bulk_create(ignore_conflicts=True).
+    Значения вставляются как есть: bulk_create подменил бы pub_date
+    из CSV текущим временем.
+    """
+    quote = db.ops.quote_name
+    fields = model._meta.concrete_fields
+    return (
+        'INSERT INTO {} ({}) VALUES ({}) ON CONFLICT ({}) DO NOTHING'
+    ).format(
+        quote(model._meta.db_table),
+        ', '.join(quote(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields)),
+        quote(model._meta.pk.column),
+    )
+
+
+class LineReader:
+    """
+    Построчно читает файл в двоичном режиме и помнит смещение конца
+    последней прочитанной строки: csv.reader берёт строки по одной,
+    поэтому после каждой записи CSV смещение указывает на её конец.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.offset = file.tell()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.file.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode('utf-8')
+
+    def seek(self, offset):
+        self.file.seek(offset)
+        self.offset = offset
+
+
+SOURCE_EXTENSIONS = ('.csv', '.csv.gz', '.jsonl', '.jsonl.gz')
+
+
+def open_source(path):
+    """Файл выгрузки в двоичном режиме; .gz распаковывается на лету."""
+    if str(path).endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def is_jsonl(path):
+    return '.jsonl' in Path(path).suffixes
+
+
+def jsonl_value(value):
+    return '' if value is None else str(value)
+
+
+def parse_records(lines, header, jsonl=False):
+    """
+    Записи файла как списки строк в порядке header: CSV разбирается
+    csv.reader, а в JSON Lines каждая непустая строка — объект.
+    """
+    if not jsonl:
+        return csv.reader(lines)
+    return (
+        [jsonl_value(record.get(column)) for column in header]
+        for record in map(json.loads, filter(str.strip, lines))
+    )
+
+
+def read_header(path):
+    """
+    Заголовок и смещение начала первой записи. В JSON Lines заголовок —
+    ключи первого объекта, а записи начинаются с начала файла.
+    """
+    with open_source(path) as file:
+        lines = LineReader(file)
+        if is_jsonl(path):
+            first = next(filter(str.strip, lines), None)
+            return (None if first is None else list(json.loads(first))), 0
+        header = next(csv.reader(lines), None)
+        if header is None:
+            return None, lines.offset
+        header[0] = header[0].lstrip('\ufeff')
+        return header, lines.offset
+
+
+def read_batches(path, batch_size=BATCH_SIZE, offset=None):
+    """
+    Читает файл пачками по batch_size записей и отдаёт кортежи
+    (заголовок, записи, смещение конца пачки). Держит в памяти только
+    текущую пачку; offset — смещение, с которого продолжить чтение.
+    """
+    header, start = read_header(path)
+    if header is None:
+        return
+    with open_source(path) as file:
+        lines = LineReader(file)
+        lines.seek(offset or start)
+        reader = parse_records(lines, header, is_jsonl(path))
+        while True:
+            batch = list(islice(reader, batch_size))
+            if not batch:
+                return
+            yield header, batch, lines.offset
+
+
+def chunk_bounds(path, start, chunk_bytes=CHUNK_BYTES):
+    """
+    Делит файл с позиции start на фрагменты примерно по chunk_bytes байт.
+    В CSV граница ставится только в конце строки с чётным числом кавычек
+    от начала фрагмента: перевод строки внутри кавычек не разрывает
+    запись. В JSON Lines каждая строка — целая запись.
+    """
+    bounds = [start]
+    target = start + chunk_bytes
+    offset = start
+    quoted = False
+    jsonl = is_jsonl(path)
+    with open_source(path) as file:
+        file.seek(start)
+        for line in iter(file.readline, b''):
+            offset += len(line)
+            if not jsonl:
+                quoted ^= line.count(b'"') % 2 == 1
+            if not quoted and offset >= target:
+                bounds.append(offset)
+                target = offset + chunk_bytes
+    if offset > bounds[-1]:
+        bounds.append(offset)
+    return list(zip(bounds, bounds[1:]))
+
+
+def read_chunk(path, start, end, header=None):
+    with open_source(path) as file:
+        file.seek(start)
+        text = file.read(end - start).decode('utf-8')
+    lines = io.StringIO(text, newline='')
+    return list(parse_records(lines, header, is_jsonl(path)))
+
+
+class ImportDataError(Exception):
+    pass
+
+
+def convert_rows(table, header, rows, db=connection):
+    return RowConverter(table.model, header, db)(rows)
+
+
+def check_links(model, values, db=connection):
+    """
+    Проверяет внешние ключи пачки строк промежуточной таблицы: id пачки
+    сверяются со связанной таблицей запросами с числом параметров не
+    больше допустимого для СУБД. Строки, прошедшие BatchValidator,
+    уже сверены с битовыми картами id и сюда не передаются.
+    """
+    size = min(
+        db.features.max_query_params or LINKS_BATCH_SIZE, LINKS_BATCH_SIZE
+    )
+    for index, field in enumerate(model._meta.concrete_fields):
+        if not field.is_relation:
+            continue
+        ids = sorted({row[index] for row in values})
+        objects = field.related_model.objects.using(db.alias)
+        missing = []
+        for start in range(0, len(ids), size):
+            batch = ids[start:start + size]
+            found = set(objects.filter(pk__in=batch).values_list(
+                'pk', flat=True
+            ))
+            missing.extend(pk for pk in batch if pk not in found)
+        if missing:
+            raise ImportDataError(
+                f'В таблице {model._meta.db_table} есть ссылки на '
+                f'несуществующие {field.name}: '
+                f'{", ".join(map(str, missing[:10]))}.'
+            )
+
+
+def insert_rows(table, values, db=connection, check=True):
+    """
+    Вставляет значения колонок пачки одним executemany в точке
+    сохранения. Если пачка нарушает ограничение уникальности (slug,
+    username, отзыв автора на произведение), строки вставляются
+    по одной, и возвращается список (номер строки, ошибка) для не
+    вставленных. check=False — ссылки пачки уже проверены валидатором.
+    """
+    if check and table.model._meta.auto_created:
+        check_links(table.model, values, db)
+    sql = insert_sql(table.model, db)
+    try:
+        with transaction.atomic(using=db.alias), db.cursor() as cursor:
+            cursor.executemany(sql, values)
+        return []
+    except IntegrityError:
+        pass
+    conflicts = []
+    with db.cursor() as cursor:
+        for index, value in enumerate(values):
+            try:
+                with transaction.atomic(using=db.alias):
+                    cursor.execute(sql, value)
+            except IntegrityError as error:
+                conflicts.append((index, str(error)))
+    return conflicts
+
+
+def write_rows(table, header, rows, db=connection, check=True):
+    return insert_rows(
+        table, convert_rows(table, header, rows, db), db, check
+    )
+
+
+def reject_conflicts(table, header, rows, conflicts, validator=None):
+    """
+    Передаёт строки, нарушившие ограничение уникальности, в файл
+    отказов validator; без validator прерывает загрузку.
+    """
+    if not conflicts:
+        return
+    if validator is None:
+        index, error = conflicts[0]
+        raise ImportDataError(
+            f'Строка {",".join(rows[index])} таблицы {table.name} нарушает '
+            f'ограничение уникальности: {error}.'
+        )
+    validator.record(table, header, [
+        (rows[index], f'конфликт уникальности: {error}')
+        for index, error in conflicts
+    ])
+
+
+class IdSet:
+    """
+    Множество неотрицательных целых id в виде битовой карты:
+    10 млн id занимают 1,25 МБ вместо сотен мегабайт у set.
+    """
+
+    def __init__(self, ids=()):
+        self.bits = bytearray()
+        self.update(ids)
+
+    def add(self, value):
+        if value < 0:
+            raise ValueError(f'Отрицательный id {value} не хранится в IdSet.')
+        index = value >> 3
+        if index >= len(self.bits):
+            self.bits.extend(
+                bytes(max(index + 1, 2 * len(self.bits)) - len(self.bits))
+            )
+        self.bits[index] |= 1 << (value & 7)
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def __contains__(self, value):
+        index = value >> 3
+        return (
+            0 <= index < len(self.bits)
+            and bool(self.bits[index] & (1 << (value & 7)))
+        )
+
+
+class Checkpoint:
+    """
+    Позиция загрузки по таблицам: файл, смещение после последней
+    зафиксированной пачки и число загруженных строк. Сохраняется
+    в JSON после каждой пачки; без path ничего не записывает.
+    """
+
+    def __init__(self, path=None, resume=False):
+        self.path = path
+        self.state = {}
+        if path and resume and os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                self.state = json.load(file)
+
+    def position(self, table, path):
+        """Смещение и число строк, с которых продолжить загрузку."""
+        saved = self.state.get(table)
+        if saved is None or saved['path'] != os.path.abspath(path):
+            return None, 0
+        return saved['offset'], saved['rows']
+
+    def is_done(self, table, path):
+        saved = self.state.get(table)
+        return bool(
+            saved and saved['done']
+            and saved['path'] == os.path.abspath(path)
+        )
+
+    def save(self, table, path, offset, rows, done=False):
+        self.state[table] = {
+            'path': os.path.abspath(path),
+            'offset': offset,
+            'rows': rows,
+            'done': done,
+        }
+        if not self.path:
+            return
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(self.state, file)
+        os.replace(temporary, self.path)
+
+    def clear(self):
+        self.state = {}
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def store_batch(table, header, rows, upsert=None, validator=None,
+                db=connection):
+    """
+    Пишет пачку записей файла: validator отбрасывает ошибочные строки,
+    с upsert пишутся только новые и изменённые.
+    """
+    check = validator is None
+    if not check:
+        rows = validator.split(table, header, rows)
+    if upsert is None:
+        conflicts = write_rows(table, header, rows, db, check)
+        reject_conflicts(table, header, rows, conflicts, validator)
+    else:
+        upsert.write(table, header, rows, check)
+
+
+def load_table(table, path, batch_size=BATCH_SIZE, checkpoint=None,
+               progress=None, upsert=None, validator=None, db=connection):
+    """
+    Загружает CSV пачками по batch_size строк, каждую пачку — в отдельной
+    транзакции, после которой сохраняется контрольная точка.
+    progress(таблица, строк, строк в секунду) вызывается после каждой
+    пачки. С upsert пачки пишутся через upsert.write, с validator
+    ошибочные строки пропускаются.
+    Возвращает число прочитанных строк с учётом прошлых запусков.
+    """
+    if checkpoint is None:
+        checkpoint = Checkpoint()
+    offset, loaded = checkpoint.position(table.name, path)
+    resumed = loaded
+    started = time.perf_counter()
+    for header, batch, offset in read_batches(path, batch_size, offset):
+        with transaction.atomic(using=db.alias):
+            store_batch(table, header, batch, upsert, validator, db)
+        loaded += len(batch)
+        checkpoint.save(table.name, path, offset, loaded)
+        if progress is not None:
+            elapsed = max(time.perf_counter() - started, 1e-6)
+            progress(table.name, loaded, (loaded - resumed) / elapsed)
+    checkpoint.save(table.name, path, offset, loaded, done=True)
+    return loaded
+
+
+def table_levels(tables=TABLES):
+    """
+    Группы таблиц по графу внешних ключей: таблицы группы зависят
+    только от таблиц предыдущих групп и могут загружаться одновременно.
+    """
+    names = {table.model: table.name for table in tables}
+    dependencies = {
+        table.name: {
+            names[field.related_model]
+            for field in table.model._meta.concrete_fields
+            if field.is_relation and field.related_model in names
+            and field.related_model is not table.model
+        }
+        for table in tables
+    }
+    levels = []
+    ready = set()
+    while len(ready) < len(tables):
+        level = [
+            table for table in tables
+            if table.name not in ready and dependencies[table.name] <= ready
+        ]
+        if not level:
+            raise ValueError('Циклическая зависимость между таблицами.')
+        levels.append(level)
+        ready.update(table.name for table in level)
+    return levels
+
+
+worker_validator = None
+
+
+def init_worker(ids=None):
+    """
+    Настройка процесса пула. С ids — битовыми картами связанных таблиц —
+    процесс сам проверяет строки фрагментов.
+    """
+    global worker_validator
+    django.setup()
+    if ids is not None:
+        from .validation import BatchValidator
+
+        worker_validator = BatchValidator(ids=ids)
+
+
+def parse_chunk(table_name, header, path, start, end, convert=True):
+    """
+    Разбор, проверка и преобразование фрагмента файла в процессе пула.
+    Возвращает (строки или значения колонок, отклонённые строки
+    с причинами, число записей фрагмента).
+    """
+    table = next(table for table in TABLES if table.name == table_name)
+    rows = read_chunk(path, start, end, header)
+    total = len(rows)
+    rejects = []
+    if worker_validator is not None:
+        rows, rejects = worker_validator.check(table, header, rows)
+    if convert:
+        rows = convert_rows(table, header, rows)
+    return rows, rejects, total
+
+
+def chunk_rows(chunk, validator=None):
+    """Строки фрагмента, прошедшие проверку, в порядке parse_chunk."""
+    rows = read_chunk(chunk.path, chunk.start, chunk.end, chunk.header)
+    if validator is not None:
+        rows, _ = validator.check(chunk.table, chunk.header, rows)
+    return rows
+
+
+def store_chunk(chunk, result, upsert=None, validator=None, db=connection):
+    """
+    Записывает результат parse_chunk одной транзакцией: отклонённые
+    строки — в validator, остальные — вставкой или через upsert.
+    Строки фрагмента, нарушившие ограничение уникальности, читаются
+    из файла заново: процессы пула передают только значения колонок.
+    Возвращает число записей фрагмента.
+    """
+    values, rejects, total = result
+    with transaction.atomic(using=db.alias):
+        if validator is not None:
+            validator.record(chunk.table, chunk.header, rejects)
+        check = validator is None
+        if upsert is None:
+            conflicts = insert_rows(chunk.table, values, db, check)
+            if conflicts:
+                reject_conflicts(
+                    chunk.table, chunk.header, chunk_rows(chunk, validator),
+                    conflicts, validator
+                )
+        else:
+            upsert.write(chunk.table, chunk.header, values, check)
+    return total
+
+
+def load_level(level, sources, executor, workers, checkpoint,
+               progress=None, upsert=None, validator=None,
+               chunk_bytes=CHUNK_BYTES, db=connection):
+    """
+    Разбирает файлы таблиц группы фрагментами в пуле процессов, не
+    держа в работе больше 2 * workers фрагментов. Вставка идёт только
+    в основном процессе: фрагмент — одна транзакция, затем контрольная
+    точка. Фрагменты таблицы вставляются в порядке файла. Проверку
+    строк validator процессы пула делают сами (см. init_worker),
+    а в основном процессе остаются запись и файл отказов. С upsert
+    процессы не преобразуют строки: upsert.write преобразует только
+    изменившиеся.
+    Возвращает {таблица: число строк}.
+    """
+    chunks = []
+    loaded = {}
+    for table in level:
+        path = sources[table.name]
+        header, start = read_header(path)
+        offset, loaded[table.name] = checkpoint.position(table.name, path)
+        if header is None:
+            continue
+        chunks.extend(
+            Chunk(table, header, path, *bounds)
+            for bounds in chunk_bounds(path, offset or start, chunk_bytes)
+        )
+    chunks.sort(key=lambda chunk: chunk.start)
+    resumed = dict(loaded)
+    started = time.perf_counter()
+    chunks = iter(chunks)
+    pending = deque()
+    convert = upsert is None
+
+    def submit(chunk):
+        pending.append((chunk, executor.submit(
+            parse_chunk, chunk.table.name, chunk.header, chunk.path,
+            chunk.start, chunk.end, convert
+        )))
+
+    for chunk in islice(chunks, 2 * workers):
+        submit(chunk)
+    while pending:
+        chunk, future = pending.popleft()
+        name = chunk.table.name
+        loaded[name] += store_chunk(
+            chunk, future.result(), upsert, validator, db
+        )
+        checkpoint.save(name, chunk.path, chunk.end, loaded[name])
+        if progress is not None:
+            elapsed = max(time.perf_counter() - started, 1e-6)
+            progress(name, loaded[name], (loaded[name] - resumed[name])
+                     / elapsed)
+        next_chunk = next(chunks, None)
+        if next_chunk is not None:
+            submit(next_chunk)
+    for table in level:
+        path = sources[table.name]
+        offset, _ = checkpoint.position(table.name, path)
+        checkpoint.save(table.name, path, offset, loaded[table.name],
+                        done=True)
+    return loaded
+
+
+def source_table(path):
+    """Имя таблицы по имени файла: review.csv.gz — review."""
+    return os.path.basename(path).split('.', 1)[0]
+
+
+def table_sources(data_path):
+    """
+    Файлы `<имя таблицы>.csv` каталога data_path, а также .jsonl и сжатые
+    gzip варианты: {таблица: путь}.
+    """
+    sources = {}
+    for table in TABLES:
+        for extension in SOURCE_EXTENSIONS:
+            path = os.path.join(data_path, f'{table.name}{extension}')
+            if os.path.exists(path):
+                sources[table.name] = path
+                break
+    return sources
+
+
+def finish_import(models_loaded, db=connection):
+    """
+    Массовая вставка обходит сигналы моделей: пересчитывает рейтинги,
+    сдвигает счётчики первичных ключей и версию каталога.
+    """
+    if {Title, Review} & set(models_loaded):
+        rebuild_title_scores()
+    with db.cursor() as cursor:
+        for sql in db.ops.sequence_reset_sql(no_style(), models_loaded):
+            cursor.execute(sql)
+    bump_versions(CATALOGUE)
+
+
+def load_parallel(tables, sources, workers, checkpoint, progress=None,
+                  upsert=None, validator=None, db=connection):
+    """
+    Загружает группы таблиц по очереди, каждую — своим пулом процессов:
+    с validator процессы получают битовые карты id таблиц, загруженных
+    в предыдущих группах.
+    """
+    loaded = {}
+    for level in table_levels():
+        level = [table for table in level if table in tables]
+        if not level:
+            continue
+        ids = None if validator is None else validator.level_ids(level)
+        with ProcessPoolExecutor(
+            workers, initializer=init_worker, initargs=(ids,)
+        ) as pool:
+            loaded.update(load_level(
+                level, sources, pool, workers, checkpoint, progress,
+                upsert, validator, db=db
+            ))
+    return loaded
+
+
+def import_tables(sources, batch_size=BATCH_SIZE, checkpoint=None,
+                  progress=None, workers=1, upsert=None, delete=False,
+                  validator=None, fast=True, db=connection):
+    """
+    Загружает таблицы из файлов sources ({таблица: путь}) в порядке
+    зависимостей. Уже загруженные по контрольной точке таблицы
+    пропускаются. При workers > 1 файлы разбираются в пуле процессов.
+    С upsert пишутся только новые и изменённые строки, а с delete
+    до записи удаляются строки, пропавшие из файлов. С validator строки,
+    не прошедшие проверку, пропускаются. fast=False оставляет
+    прагмы SQLite как есть: так загружают в базу работающего сайта,
+    которую обрыв загрузки с synchronous=OFF мог бы повредить.
+    Возвращает {таблица: число строк}.
+    """
+    if checkpoint is None:
+        checkpoint = Checkpoint()
+    tables = [table for table in TABLES if table.name in sources]
+    loaded = {
+        table.name: checkpoint.position(table.name, sources[table.name])[1]
+        for table in tables
+        if checkpoint.is_done(table.name, sources[table.name])
+    }
+    pending = [table for table in tables if table.name not in loaded]
+    with fast_load(db) if fast else nullcontext():
+        if upsert is not None and delete:
+            for table in reversed(tables):
+                upsert.scan(table, sources[table.name])
+                upsert.delete_missing(table)
+        if workers > 1:
+            loaded.update(load_parallel(
+                pending, sources, workers, checkpoint, progress, upsert,
+                validator, db
+            ))
+        else:
+            for table in pending:
+                loaded[table.name] = load_table(
+                    table, sources[table.name], batch_size, checkpoint,
+                    progress, upsert, validator, db
+                )
+    finish_import([table.model for table in tables], db)
+    checkpoint.clear()
+    return {table.name: loaded[table.name] for table in tables}
@@ -0,0 +1,221 @@
+import os
+import shutil
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.utils import timezone
+
+from .importers import (SOURCE_EXTENSIONS, Checkpoint, import_tables,
+                        table_sources)
+from .models import ImportJob
+from .validation import BatchValidator, RejectFiles
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+PROGRESS_INTERVAL = 1
+HEARTBEAT_INTERVAL = 10
+STALE_AFTER = timedelta(seconds=6 * HEARTBEAT_INTERVAL)
+CHECKPOINT_NAME = 'checkpoint.json'
+REJECTS_NAME = 'rejects'
+
+
+def job_path(job_id):
+    return os.path.join(settings.IMPORT_JOBS_ROOT, str(job_id))
+
+
+def upload_extension(name):
+    """Расширение загруженного файла из SOURCE_EXTENSIONS или None."""
+    return next((
+        extension
+        for extension in sorted(SOURCE_EXTENSIONS, key=len, reverse=True)
+        if name.endswith(extension)
+    ), None)
+
+
+def save_upload(job_id, table, upload):
+    """
+    Пишет загруженный файл в каталог задачи частями: сам файл Django
+    уже принял во временный файл на диске, в память он не читается.
+    """
+    directory = job_path(job_id)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(
+        directory, f'{table}{upload_extension(upload.name)}'
+    )
+    with open(path, 'wb') as file:
+        for chunk in upload.chunks(UPLOAD_CHUNK_SIZE):
+            file.write(chunk)
+    return path
+
+
+class JobProgress:
+    """
+    Callback прогресса import_tables: не чаще раза в PROGRESS_INTERVAL
+    секунд пишет в задачу число обработанных и отклонённых строк
+    и скорость загрузки.
+    """
+
+    def __init__(self, job_id, validator):
+        self.job_id = job_id
+        self.validator = validator
+        self.tables = {}
+        self.started = time.perf_counter()
+        self.reported = time.monotonic()
+
+    def __call__(self, table, rows, rate):
+        self.tables[table] = {
+            'rows': rows,
+            'rejected': self.validator.rejected[table],
+            'rows_per_second': round(rate),
+        }
+        now = time.monotonic()
+        if now - self.reported >= PROGRESS_INTERVAL:
+            self.reported = now
+            self.save()
+
+    def save(self, **fields):
+        rows = sum(table['rows'] for table in self.tables.values())
+        elapsed = max(time.perf_counter() - self.started, 1e-6)
+        ImportJob.objects.filter(pk=self.job_id).update(
+            tables=self.tables,
+            rows=rows,
+            rejected=sum(self.validator.rejected.values()),
+            rows_per_second=round(rows / elapsed),
+            **fields
+        )
+
+
+class Heartbeat:
+    """
+    Пока идёт загрузка, отдельный поток раз в HEARTBEAT_INTERVAL
+    секунд отмечает в задаче, что процесс жив: задачу убитого процесса
+    fail_stale_jobs переводит в failed. Поток не зависит от размера
+    пачек и пересчёта рейтингов в конце загрузки.
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        try:
+            while not self.stopped.wait(HEARTBEAT_INTERVAL):
+                try:
+                    ImportJob.objects.filter(pk=self.job_id).update(
+                        heartbeat=timezone.now()
+                    )
+                except DatabaseError:
+                    pass
+        finally:
+            connections.close_all()
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+
+def claim_job(job_id):
+    """
+    Переводит задачу из pending в running одним условным UPDATE:
+    из нескольких процессов задачу получит только один.
+    """
+    now = timezone.now()
+    return bool(ImportJob.objects.filter(
+        pk=job_id, status=ImportJob.PENDING
+    ).update(status=ImportJob.RUNNING, started=now, heartbeat=now))
+
+
+def next_job():
+    """Id самой ранней ожидающей задачи или None."""
+    return ImportJob.objects.filter(
+        status=ImportJob.PENDING
+    ).order_by('pk').values_list('pk', flat=True).first()
+
+
+def fail_stale_jobs():
+    """Помечает failed задачи, процесс которых перестал подавать сигнал."""
+    now = timezone.now()
+    return ImportJob.objects.filter(
+        status=ImportJob.RUNNING, heartbeat__lt=now - STALE_AFTER
+    ).update(
+        status=ImportJob.FAILED, finished=now,
+        error='Процесс загрузки прервался.'
+    )
+
+
+def remove_sources(job_id):
+    """
+    Удаляет загруженные файлы и контрольную точку завершённой задачи;
+    остаются только отклонённые строки.
+    """
+    directory = job_path(job_id)
+    if not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name != REJECTS_NAME and os.path.isfile(path):
+            os.remove(path)
+
+
+def prune_jobs():
+    """
+    Удаляет каталоги задач, завершённых раньше чем IMPORT_JOBS_RETENTION
+    назад, вместе с файлами отказов.
+    """
+    finished = ImportJob.objects.filter(
+        status__in=(ImportJob.DONE, ImportJob.FAILED),
+        finished__lt=timezone.now() - settings.IMPORT_JOBS_RETENTION,
+    ).values_list('pk', flat=True)
+    for job_id in finished.iterator():
+        shutil.rmtree(job_path(job_id), ignore_errors=True)
+
+
+def run_import_job(job_id):
+    """
+    Загружает файлы задачи с проверкой строк. Отклонённые строки
+    пишутся в `rejects/` каталога задачи, контрольная точка — рядом.
+    Прагмы быстрой загрузки SQLite не включаются: база обслуживает
+    сайт. При любой ошибке задача помечается failed с текстом ошибки.
+    Возвращает False, если задача уже не ожидает запуска.
+    """
+    if not claim_job(job_id):
+        return False
+    prune_jobs()
+    directory = job_path(job_id)
+    validator = BatchValidator(
+        RejectFiles(os.path.join(directory, REJECTS_NAME))
+    )
+    progress = JobProgress(job_id, validator)
+    try:
+        with Heartbeat(job_id):
+            loaded = import_tables(
+                table_sources(directory),
+                checkpoint=Checkpoint(
+                    os.path.join(directory, CHECKPOINT_NAME)
+                ),
+                progress=progress,
+                validator=validator,
+                fast=False,
+            )
+    except Exception as error:
+        progress.save(status=ImportJob.FAILED, error=str(error),
+                      finished=timezone.now())
+        raise
+    finally:
+        validator.rejects.close()
+        remove_sources(job_id)
+    for table, rows in loaded.items():
+        progress.tables.setdefault(table, {
+            'rows': rows,
+            'rejected': validator.rejected[table],
+            'rows_per_second': 0,
+        })
+    progress.save(status=ImportJob.DONE, finished=timezone.now())
+    return True
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management import BaseCommand, CommandError
+from django.db import NotSupportedError
+
+from reviews.snapshots import restore_snapshot, save_snapshot
+
+ACTIONS = {
+    'save': (save_snapshot, 'Снимок базы сохранён'),
+    'restore': (restore_snapshot, 'База восстановлена из снимка'),
+}
+
+
+class Command(BaseCommand):
+    help = "Saves or restores a database snapshot"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'action',
+            choices=ACTIONS,
+            help='save — сохранить снимок базы, restore — восстановить.'
+        )
+        parser.add_argument(
+            'path',
+            help='Файл снимка.'
+        )
+
+    def handle(self, *args, **options):
+        action, message = ACTIONS[options['action']]
+        started = time.perf_counter()
+        try:
+            action(options['path'])
+        except (NotSupportedError, FileNotFoundError) as error:
+            raise CommandError(error)
+        self.stdout.write(self.style.SUCCESS(
+            f'{message} за {time.perf_counter() - started:.2f} с!'
+        ))
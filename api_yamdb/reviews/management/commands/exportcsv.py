@@ -0,0 +1,54 @@
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from reviews.exporters import CSV, FORMATS, export_tables
+from reviews.importers import TABLES
+
+EXPORT_PATH = 'export/'
+
+
+class Command(BaseCommand):
+    help = "Exports data to csv or jsonl"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'tables',
+            nargs='*',
+            help='Таблицы для выгрузки; по умолчанию все.'
+        )
+        parser.add_argument(
+            '--path',
+            default=EXPORT_PATH,
+            help='Каталог для файлов выгрузки.'
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            default=CSV,
+            help='Формат файлов: CSV или JSON Lines.'
+        )
+        parser.add_argument(
+            '--no-gzip',
+            action='store_true',
+            help='Не сжимать файлы gzip.'
+        )
+
+    def report_progress(self, table, rows, path):
+        self.stdout.write(f'{table}: {rows} строк в {path}')
+
+    def handle(self, *args, **options):
+        unknown = set(options['tables']) - {table.name for table in TABLES}
+        if unknown:
+            raise CommandError(
+                f'Неизвестные таблицы: {", ".join(sorted(unknown))}.'
+            )
+        started = time.perf_counter()
+        export_tables(
+            options['path'], options['format'], not options['no_gzip'],
+            options['tables'], self.report_progress
+        )
+        self.stdout.write(self.style.SUCCESS(
+            'Данные успешно выгружены '
+            f'за {time.perf_counter() - started:.2f} с!'
+        ))
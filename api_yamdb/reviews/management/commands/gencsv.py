@@ -0,0 +1,74 @@
+import time
+
+from django.core.management import BaseCommand
+
+from reviews.generators import MAX_YEAR, generate_dataset
+
+GENERATED_PATH = 'generated/'
+
+
+class Command(BaseCommand):
+    help = "Generates a synthetic dataset in importcsv format"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=GENERATED_PATH,
+            help='Каталог для сгенерированных файлов.'
+        )
+        parser.add_argument('--users', type=int, default=1000,
+                            help='Число пользователей.')
+        parser.add_argument('--titles', type=int, default=1000,
+                            help='Число произведений.')
+        parser.add_argument('--genres', type=int, default=15,
+                            help='Число жанров.')
+        parser.add_argument('--categories', type=int, default=3,
+                            help='Число категорий.')
+        parser.add_argument(
+            '--reviews-per-title',
+            type=float,
+            default=10.0,
+            help='Среднее число отзывов на произведение.'
+        )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Показатель закона Ципфа для числа отзывов.'
+        )
+        parser.add_argument(
+            '--comments-per-review',
+            type=float,
+            default=1.0,
+            help='Среднее число комментариев к отзыву.'
+        )
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Зерно генератора случайных чисел.')
+        parser.add_argument('--max-year', type=int, default=MAX_YEAR,
+                            help='Наибольший год выпуска произведений.')
+        parser.add_argument('--gzip', action='store_true',
+                            help='Сжимать файлы gzip.')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        counts = generate_dataset(
+            options['path'],
+            users=options['users'],
+            titles=options['titles'],
+            genres=options['genres'],
+            categories=options['categories'],
+            reviews_per_title=options['reviews_per_title'],
+            zipf=options['zipf'],
+            comments_per_review=options['comments_per_review'],
+            seed=options['seed'],
+            compress=options['gzip'],
+            max_year=options['max_year'],
+        )
+        for table, rows in counts.items():
+            self.stdout.write(f'{table}: {rows} строк')
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Сгенерировано {total} строк за {elapsed:.2f} с '
+            f'({total / elapsed:.0f} строк/с)!'
+        ))
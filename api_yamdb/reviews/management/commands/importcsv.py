@@ -1,78 +1,194 @@
-import csv
+import os
+import time
 
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
+from django.db import NotSupportedError
 
-from reviews.models import User, Category, Genre, Title, Review, Comment
+from reviews.importers import (BATCH_SIZE, TABLES, Checkpoint,
+                               ImportDataError, import_tables, source_table,
+                               table_sources)
+from reviews.upserts import Upsert
+from reviews.validation import REJECTS_PATH, BatchValidator, RejectFiles
 
 CSV_PATH = 'static/data/'
+CHECKPOINT_PATH = 'importcsv.checkpoint.json'
+PROGRESS_INTERVAL = 1
 
 
 class Command(BaseCommand):
     help = "Loads data from csv"
 
-    def handle(self, *args, **options):
-
-        with open('static/data/users.csv', 'r', encoding='utf-8') as csvfile:
-            dict_reader = csv.DictReader(csvfile)
-            for row in dict_reader:
-                User.objects.get_or_create(
-                    id=row['id'],
-                    username=row['username'],
-                    email=row['email'],
-                    role=row['role'],
-                    bio=row['bio'],
-                    first_name=row['first_name'],
-                    last_name=row['last_name'])
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'files',
+            nargs='*',
+            help=(
+                'Файлы CSV или JSON Lines, в том числе сжатые gzip, в виде '
+                '[таблица=]путь; без явной таблицы она определяется по '
+                'имени файла (review.csv.gz — review).'
+            )
+        )
+        parser.add_argument(
+            '--path',
+            default=CSV_PATH,
+            help='Каталог с CSV-файлами таблиц, если файлы не указаны.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Число строк в одной транзакции.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help=(
+                'Число процессов для разбора CSV; 0 — по числу ядер. '
+                'Вставка в базу всегда идёт в одном процессе.'
+            )
+        )
+        parser.add_argument(
+            '--upsert',
+            action='store_true',
+            help=(
+                'Обновлять строки по id из CSV и пропускать строки, не '
+                'изменившиеся с прошлого импорта.'
+            )
+        )
+        parser.add_argument(
+            '--delete',
+            action='store_true',
+            help=(
+                'Вместе с --upsert: удалить ранее импортированные строки, '
+                'которых нет в файлах.'
+            )
+        )
+        parser.add_argument(
+            '--no-validate',
+            action='store_true',
+            help='Не проверять строки перед записью.'
+        )
+        parser.add_argument(
+            '--rejects',
+            default=REJECTS_PATH,
+            help=(
+                'Каталог для строк, не прошедших проверку: '
+                '<таблица>.csv с причиной отказа.'
+            )
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=CHECKPOINT_PATH,
+            help='Файл контрольной точки загрузки.'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Продолжить загрузку с последней контрольной точки.'
+        )
 
-        with open('static/data/category.csv', 'r',
-                  encoding='utf-8') as csvfile:
-            dict_reader = csv.DictReader(csvfile)
-            for row in dict_reader:
-                Category.objects.get_or_create(
-                    name=row['name'],
-                    slug=row['slug'])
+    def get_sources(self, files, data_path):
+        if not files:
+            return table_sources(data_path)
+        tables = {table.name for table in TABLES}
+        sources = {}
+        for source in files:
+            table, _, path = source.rpartition('=')
+            if not table:
+                table = source_table(path)
+            if table not in tables:
+                raise CommandError(
+                    f'Неизвестная таблица {table} для файла {path}. '
+                    f'Доступны: {", ".join(sorted(tables))}.'
+                )
+            if not os.path.isfile(path):
+                raise CommandError(f'Файл {path} не найден.')
+            sources[table] = path
+        return sources
 
-        with open('static/data/genre.csv', 'r', encoding='utf-8') as csvfile:
-            dict_reader = csv.DictReader(csvfile)
-            for row in dict_reader:
-                Genre.objects.get_or_create(
-                    name=row['name'],
-                    slug=row['slug'])
+    def report_progress(self, table, rows, rate):
+        self.rates[table] = rate
+        now = time.monotonic()
+        if now - self.reported < PROGRESS_INTERVAL:
+            return
+        self.reported = now
+        self.stdout.write(f'{table}: {rows} строк, {rate:.0f} строк/с')
 
-        with open('static/data/titles.csv', 'r', encoding='utf-8') as csvfile:
-            dict_reader = csv.DictReader(csvfile)
-            for row in dict_reader:
-                Title.objects.get_or_create(
-                    name=row['name'],
-                    year=row['year'],
-                    category_id=row['category'])
+    def get_upsert(self, options, validator):
+        if options['delete'] and not options['upsert']:
+            raise CommandError('--delete работает только вместе с --upsert.')
+        if options['delete'] and options['resume']:
+            raise CommandError(
+                '--delete нельзя сочетать с --resume: строки, загруженные '
+                'до обрыва, были бы удалены.'
+            )
+        if not options['upsert']:
+            return None
+        try:
+            return Upsert(
+                rejects=None if validator is None else validator.rejects
+            )
+        except NotSupportedError as error:
+            raise CommandError(error)
 
-        with open('static/data/genre_title.csv') as csvfile:
-            dict_reader = csv.DictReader(csvfile)
-            for row in dict_reader:
-                title = Title.objects.get(id=row['title_id'])
-                title.genre.add(row['genre_id'])
+    def get_validator(self, options):
+        if options['no_validate']:
+            return None
+        return BatchValidator(
+            RejectFiles(options['rejects'], options['resume'])
+        )
 
-        with open('static/data/review.csv', 'r', encoding='utf-8') as csvfile:
-            dict_reader = csv.DictReader(csvfile)
-            for row in dict_reader:
-                Review.objects.get_or_create(
-                    title_id=row['title_id'],
-                    text=row['text'],
-                    author_id=row['author'],
-                    score=row['score'],
-                    pub_date=row['pub_date'])
-
-        with open('static/data/comments.csv', 'r',
-                  encoding='utf-8') as csvfile:
-            dict_reader = csv.DictReader(csvfile)
-            for row in dict_reader:
-                Comment.objects.get_or_create(
-                    review_id=row['review_id'],
-                    text=row['text'],
-                    author_id=row['author'],
-                    pub_date=row['pub_date'])
+    def report_summary(self, loaded, upsert, validator):
+        for table, rows in loaded.items():
+            if table in self.rates:
+                self.stdout.write(
+                    f'{table}: {rows} строк, {self.rates[table]:.0f} строк/с'
+                )
+            else:
+                self.stdout.write(f'{table}: {rows} строк')
+            if upsert is not None:
+                self.stdout.write(
+                    f'  записано {upsert.written[table]}, '
+                    f'без изменений {upsert.skipped[table]}, '
+                    f'удалено {upsert.deleted[table]}'
+                )
+            if upsert is not None and upsert.rejected[table]:
+                self.stdout.write(self.style.WARNING(
+                    f'  конфликтов уникальности {upsert.rejected[table]}, '
+                    f'см. {upsert.rejects.table_path(table)}'
+                ))
+            if validator is not None and validator.rejected[table]:
+                self.stdout.write(self.style.WARNING(
+                    f'  отклонено {validator.rejected[table]}, см. '
+                    f'{validator.rejects.table_path(table)}'
+                ))
 
+    def handle(self, *args, **options):
+        sources = self.get_sources(options['files'], options['path'])
+        workers = options['workers'] or os.cpu_count()
+        if workers < 1:
+            raise CommandError('Число процессов должно быть положительным.')
+        validator = self.get_validator(options)
+        upsert = self.get_upsert(options, validator)
+        checkpoint = Checkpoint(options['checkpoint'], options['resume'])
+        self.reported = time.monotonic()
+        self.rates = {}
+        started = time.perf_counter()
+        try:
+            loaded = import_tables(
+                sources, options['batch_size'], checkpoint,
+                self.report_progress, workers, upsert, options['delete'],
+                validator
+            )
+        except ImportDataError as error:
+            raise CommandError(error)
+        finally:
+            if validator is not None:
+                validator.rejects.close()
+        elapsed = time.perf_counter() - started
+        self.report_summary(loaded, upsert, validator)
         self.stdout.write(self.style.SUCCESS(
-            'Данные из CSV успешно импортированы!'
+            'Данные из CSV успешно импортированы '
+            f'за {elapsed:.2f} с!'
         ))
@@ -0,0 +1,13 @@
+from django.core.management import BaseCommand
+
+from reviews.ratings import rebuild_title_scores
+
+
+class Command(BaseCommand):
+    help = "Rebuilds stored title ratings from reviews"
+
+    def handle(self, *args, **options):
+        updated = rebuild_title_scores()
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинг пересчитан для {updated} произведений!'
+        ))
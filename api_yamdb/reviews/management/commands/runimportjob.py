@@ -0,0 +1,74 @@
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from reviews.jobs import fail_stale_jobs, next_job, run_import_job
+from reviews.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = "Runs uploaded CSV import jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'job_id',
+            type=int,
+            nargs='?',
+            help=(
+                'Id задачи загрузки; без него выполняются все ожидающие '
+                'задачи по очереди.'
+            )
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval с.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между проверками очереди в режиме --loop.'
+        )
+
+    def report(self, job_id):
+        job = ImportJob.objects.get(pk=job_id)
+        self.stdout.write(self.style.SUCCESS(
+            f'Задача {job_id} выполнена: {job.rows} строк, '
+            f'отклонено {job.rejected}, {job.rows_per_second:.0f} строк/с!'
+        ))
+
+    def drain(self):
+        """
+        Выполняет ожидающие задачи по одной, пока очередь не опустеет.
+        Задачу, которую уже забрал другой процесс, run_import_job
+        пропускает; ошибка задачи записана в неё и не останавливает
+        обработку остальных.
+        """
+        fail_stale_jobs()
+        while True:
+            job_id = next_job()
+            if job_id is None:
+                return
+            try:
+                if run_import_job(job_id):
+                    self.report(job_id)
+            except Exception as error:
+                self.stderr.write(
+                    f'Задача {job_id} завершилась ошибкой: {error}'
+                )
+
+    def handle(self, *args, **options):
+        job_id = options['job_id']
+        if job_id is not None:
+            if not run_import_job(job_id):
+                raise CommandError(
+                    f'Нет ожидающей задачи загрузки {job_id}.'
+                )
+            self.report(job_id)
+            return
+        while True:
+            self.drain()
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,31 @@
+# Generated by Django 3.2 on 2026-10-18 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=50, verbose_name='Таблица')),
+                ('row_id', models.BigIntegerField(verbose_name='Id строки')),
+                ('digest', models.CharField(max_length=32, verbose_name='Хеш содержимого')),
+            ],
+            options={
+                'verbose_name': 'Импортированная строка',
+                'verbose_name_plural': 'Импортированные строки',
+                'ordering': ['table', 'row_id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importrecord',
+            constraint=models.UniqueConstraint(fields=('table', 'row_id'), name='unique_import_record'),
+        ),
+    ]
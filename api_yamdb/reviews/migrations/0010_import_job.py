@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-18 12:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reviews', '0009_import_record'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.SlugField(choices=[('pending', 'pending'), ('running', 'running'), ('done', 'done'), ('failed', 'failed')], default='pending', verbose_name='Статус')),
+                ('tables', models.JSONField(default=dict, verbose_name='Прогресс по таблицам')),
+                ('rows', models.PositiveBigIntegerField(default=0, verbose_name='Обработано строк')),
+                ('rejected', models.PositiveBigIntegerField(default=0, verbose_name='Отклонено строк')),
+                ('rows_per_second', models.FloatField(default=0, verbose_name='Строк в секунду')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('started', models.DateTimeField(blank=True, null=True, verbose_name='Начало загрузки')),
+                ('finished', models.DateTimeField(blank=True, null=True, verbose_name='Окончание загрузки')),
+                ('author', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Автор загрузки')),
+            ],
+            options={
+                'verbose_name': 'Загрузка CSV',
+                'verbose_name_plural': 'Загрузки CSV',
+                'ordering': ['-created'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_import_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='heartbeat',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Последний сигнал процесса загрузки'),
+        ),
+    ]
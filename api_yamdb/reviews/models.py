@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.validators import (
     MaxValueValidator,
@@ -81,15 +81,35 @@ class Title(models.Model):
         blank=True,
         null=True,
         verbose_name='Описание')
+    score_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок'
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество отзывов'
+    )
 
     class Meta:
         ordering = ['name']
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=('name', 'id'), name='title_name_id_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        """Средняя оценка по сохранённым агрегатам, без запроса к отзывам."""
+        if not self.review_count:
+            return None
+        return self.score_sum // self.review_count
+
 
 class Review(models.Model):
     title = models.ForeignKey(
@@ -109,8 +129,12 @@ class Review(models.Model):
     )
     score = models.PositiveIntegerField(
         validators=[
-            MinValueValidator(1, 'Значение должно быть от 1 до 10!'),
-            MaxValueValidator(10, 'Значение должно быть от 1 до 10!')
+            MinValueValidator(
+                settings.MIN_SCORE, 'Значение должно быть от 1 до 10!'
+            ),
+            MaxValueValidator(
+                settings.MAX_SCORE, 'Значение должно быть от 1 до 10!'
+            )
         ],
         verbose_name='Рейтинг'
     )
@@ -123,6 +147,12 @@ class Review(models.Model):
         ordering = ['pub_date']
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        ]
 
         constraints = [
             models.UniqueConstraint(
@@ -134,6 +164,62 @@ class Review(models.Model):
     def __str__(self):
         return self.title
 
+    def stored_rating(self):
+        """
+        Оценка отзыва в базе: (title_id, score) или None, если отзыва
+        там нет. Вызывается внутри транзакции сохранения или удаления,
+        строка при этом блокируется там, где СУБД это поддерживает.
+        """
+        if self.pk is None:
+            return None
+        return Review.objects.select_for_update().filter(
+            pk=self.pk
+        ).values_list('title_id', 'score').first()
+
+    def save(self, *args, **kwargs):
+        # Агрегаты рейтинга обновляются в post_save, поэтому отзыв
+        # и произведение меняются в одной транзакции, а прежняя оценка
+        # читается в ней же, а не берётся из снимка при загрузке.
+        with transaction.atomic():
+            self._rated = self.stored_rating()
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            self._rated = self.stored_rating()
+            return super().delete(*args, **kwargs)
+
+
+class TitleScore(models.Model):
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='score_counts',
+        verbose_name='Произведение'
+    )
+    score = models.PositiveSmallIntegerField(
+        verbose_name='Оценка'
+    )
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество отзывов'
+    )
+
+    class Meta:
+        ordering = ['score']
+        verbose_name = 'Счётчик оценок'
+        verbose_name_plural = 'Счётчики оценок'
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=('title', 'score'),
+                name='unique_title_score'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} x {self.count}'
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
@@ -160,6 +246,138 @@ class Comment(models.Model):
         ordering = ['pub_date']
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:settings.SYMBOL_LIMIT]
+
+
+class CollectionVersion(models.Model):
+    key = models.CharField(
+        max_length=settings.SLUG_SYM_LIMIT,
+        unique=True,
+        verbose_name='Коллекция'
+    )
+    version = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Версия'
+    )
+    modified = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения'
+    )
+
+    class Meta:
+        ordering = ['key']
+        verbose_name = 'Версия коллекции'
+        verbose_name_plural = 'Версии коллекций'
+
+    def __str__(self):
+        return f'{self.key}: {self.version}'
+
+
+class ImportRecord(models.Model):
+    table = models.CharField(
+        max_length=settings.SLUG_SYM_LIMIT,
+        verbose_name='Таблица'
+    )
+    row_id = models.BigIntegerField(
+        verbose_name='Id строки'
+    )
+    digest = models.CharField(
+        max_length=32,
+        verbose_name='Хеш содержимого'
+    )
+
+    class Meta:
+        ordering = ['table', 'row_id']
+        verbose_name = 'Импортированная строка'
+        verbose_name_plural = 'Импортированные строки'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('table', 'row_id'),
+                name='unique_import_record'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.table}: {self.row_id}'
+
+
+class ImportJob(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    STATUSES = [
+        (PENDING, 'pending'),
+        (RUNNING, 'running'),
+        (DONE, 'done'),
+        (FAILED, 'failed'),
+    ]
+
+    author = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='import_jobs',
+        verbose_name='Автор загрузки'
+    )
+    status = models.SlugField(
+        choices=STATUSES,
+        default=PENDING,
+        verbose_name='Статус'
+    )
+    tables = models.JSONField(
+        default=dict,
+        verbose_name='Прогресс по таблицам'
+    )
+    rows = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Обработано строк'
+    )
+    rejected = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Отклонено строк'
+    )
+    rows_per_second = models.FloatField(
+        default=0,
+        verbose_name='Строк в секунду'
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name='Ошибка'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+    started = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Начало загрузки'
+    )
+    finished = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Окончание загрузки'
+    )
+    heartbeat = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Последний сигнал процесса загрузки'
+    )
+
+    class Meta:
+        ordering = ['-created']
+        verbose_name = 'Загрузка CSV'
+        verbose_name_plural = 'Загрузки CSV'
+
+    def __str__(self):
+        return f'{self.pk}: {self.status}'
@@ -0,0 +1,72 @@
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Review, Title, TitleScore
+
+BATCH_SIZE = 1000
+
+
+def update_title_score(title_id, old_score=None, new_score=None):
+    """
+    Переносит замену оценки old_score на new_score в агрегаты
+    произведения и счётчики оценок. None означает отсутствие оценки:
+    новый отзыв или удалённый отзыв.
+    """
+    score_delta = (new_score or 0) - (old_score or 0)
+    count_delta = (new_score is not None) - (old_score is not None)
+    if score_delta or count_delta:
+        Title.objects.filter(pk=title_id).update(
+            score_sum=F('score_sum') + score_delta,
+            review_count=F('review_count') + count_delta,
+        )
+    if old_score is not None:
+        shift_score_count(title_id, old_score, -1)
+    if new_score is not None:
+        shift_score_count(title_id, new_score, 1)
+
+
+def shift_score_count(title_id, score, delta):
+    counters = TitleScore.objects.filter(title_id=title_id, score=score)
+    if counters.update(count=F('count') + delta) or delta < 0:
+        return
+    TitleScore.objects.bulk_create(
+        [TitleScore(title_id=title_id, score=score)],
+        ignore_conflicts=True
+    )
+    counters.update(count=F('count') + delta)
+
+
+def rebuild_title_scores(titles=None):
+    """
+    Пересчитывает агрегаты рейтинга и счётчики оценок по таблице
+    отзывов. Возвращает число обновлённых произведений.
+    """
+    if titles is None:
+        titles = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    updated = titles.update(
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0
+        ),
+        review_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')),
+            0
+        ),
+    )
+    TitleScore.objects.filter(title__in=titles).delete()
+    counts = Review.objects.filter(title__in=titles).order_by().values(
+        'title', 'score'
+    ).annotate(total=Count('pk'))
+    batch = []
+    for row in counts.iterator():
+        batch.append(TitleScore(
+            title_id=row['title'], score=row['score'], count=row['total']
+        ))
+        if len(batch) >= BATCH_SIZE:
+            TitleScore.objects.bulk_create(batch)
+            batch = []
+    TitleScore.objects.bulk_create(batch)
+    return updated
@@ -0,0 +1,86 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Title
+
+FTS_TABLE = 'reviews_title_fts'
+TITLE_TABLE = Title._meta.db_table
+# Вес совпадения в названии относительно совпадения в описании.
+NAME_WEIGHT = 10.0
+
+# Триггеры синхронизации FTS5 — те же, что создаёт миграция 0008.
+CREATE_FTS_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+    AFTER INSERT ON {TITLE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+    AFTER DELETE ON {TITLE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF name, description ON {TITLE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+)
+
+
+def restore_search_triggers(db):
+    """
+    Пересоздаёт триггеры, если таблица FTS5 уже есть: на SQLite
+    миграции пересобирают таблицу произведений вместе с триггерами.
+    """
+    if db.vendor != 'sqlite':
+        return
+    with db.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [FTS_TABLE]
+        )
+        if cursor.fetchone() is None:
+            return
+        for sql in CREATE_FTS_TRIGGERS:
+            cursor.execute(sql)
+
+
+def search_titles(queryset, text):
+    """
+    Полнотекстовый поиск по названию и описанию с сортировкой по
+    релевантности (bm25). Каждое слово запроса ищется как префикс.
+    На других СУБД — поиск подстрок без ранжирования.
+    """
+    terms = re.findall(r'\w+', text)
+    if not terms:
+        return queryset.none()
+    if connection.vendor != 'sqlite':
+        condition = Q()
+        for term in terms:
+            condition &= (
+                Q(name__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset.filter(condition)
+    match = ' '.join(f'"{term}"*' for term in terms)
+    # Соединение с таблицей FTS5 через extra(): MATCH выбирает rowid
+    # по индексу, и произведения читаются только по первичному ключу.
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = {TITLE_TABLE}.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[match],
+        select={'search_rank': f'bm25({FTS_TABLE}, {NAME_WEIGHT}, 1.0)'},
+    ).order_by('search_rank', 'name', 'id')
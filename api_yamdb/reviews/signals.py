@@ -0,0 +1,102 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import User
+from .models import Category, Comment, Genre, Review, Title
+from .ratings import update_title_score
+from .versions import (CATEGORIES, GENRES, TITLES, bump_versions,
+                       comments_key, reviews_key, title_key)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """
+    Переносит оценку отзыва в агрегаты рейтинга произведения
+    и сдвигает версии зависящих от отзыва коллекций.
+    """
+    new = (instance.title_id, int(instance.score))
+    old = None if created else getattr(instance, '_rated', None)
+    bump_versions(reviews_key(new[0]))
+    if old == new:
+        return
+    if old is not None and old[0] == new[0]:
+        update_title_score(new[0], old_score=old[1], new_score=new[1])
+    else:
+        if old is not None:
+            update_title_score(old[0], old_score=old[1])
+            bump_versions(title_key(old[0]), reviews_key(old[0]))
+        update_title_score(new[0], new_score=new[1])
+    bump_versions(TITLES, title_key(new[0]))
+    instance._rated = None
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Убирает оценку удалённого отзыва из агрегатов рейтинга."""
+    # Отзывы, удаляемые каскадом, только что прочитаны из базы,
+    # а Review.delete кладёт сохранённую оценку в _rated.
+    title_id, score = getattr(instance, '_rated', None) or (
+        instance.title_id, instance.score
+    )
+    instance._rated = None
+    update_title_score(title_id, old_score=score)
+    bump_versions(
+        TITLES, title_key(title_id), reviews_key(title_id),
+        comments_key(instance.pk)
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    bump_versions(comments_key(instance.review_id))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    bump_versions(TITLES, title_key(instance.pk), reviews_key(instance.pk))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        bump_versions(TITLES, title_key(instance.pk))
+    elif pk_set:
+        bump_versions(TITLES, *(title_key(pk) for pk in pk_set))
+    else:
+        bump_versions(TITLES, GENRES)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def genre_changed(sender, **kwargs):
+    bump_versions(GENRES)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, **kwargs):
+    bump_versions(CATEGORIES)
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created, **kwargs):
+    """Имя автора выводится в отзывах и комментариях пользователя."""
+    if created:
+        return
+    keys = {
+        reviews_key(title_id) for title_id in Review.objects.filter(
+            author=instance
+        ).values_list('title_id', flat=True)
+    }
+    keys.update(
+        comments_key(review_id) for review_id in Comment.objects.filter(
+            author=instance
+        ).values_list('review_id', flat=True).distinct()
+    )
+    if keys:
+        bump_versions(*keys)
@@ -0,0 +1,52 @@
+import os
+import sqlite3
+
+from django.db import NotSupportedError, connection
+
+from .versions import CATALOGUE, bump_versions
+
+BACKUP_PAGES = 4096
+
+
+def check_sqlite(db):
+    if db.vendor != 'sqlite':
+        raise NotSupportedError(
+            'Снимки базы поддерживаются только для SQLite.'
+        )
+
+
+def save_snapshot(path, db=connection):
+    """
+    Копирует базу в файл path через online backup API SQLite: копия
+    согласована, даже если база в это время используется. Файл
+    подменяется целиком только после успешного копирования.
+    """
+    check_sqlite(db)
+    db.ensure_connection()
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary = f'{path}.tmp'
+    target = sqlite3.connect(temporary)
+    try:
+        db.connection.backup(target, pages=BACKUP_PAGES)
+    finally:
+        target.close()
+    os.replace(temporary, path)
+
+
+def restore_snapshot(path, db=connection):
+    """
+    Заменяет содержимое базы снимком path. Снимок должен быть сделан
+    с базы с теми же миграциями. Закэшированные ответы каталога
+    перестают отдаваться: версия каталога сдвигается после загрузки.
+    """
+    check_sqlite(db)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f'Снимок {path} не найден.')
+    db.ensure_connection()
+    source = sqlite3.connect(path)
+    try:
+        source.backup(db.connection, pages=BACKUP_PAGES)
+    finally:
+        source.close()
+    bump_versions(CATALOGUE)
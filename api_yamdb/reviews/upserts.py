@@ -0,0 +1,192 @@
+import hashlib
+from collections import Counter
+
+from django.db import (IntegrityError, NotSupportedError, connection,
+                       transaction)
+
+from .importers import (IdSet, ImportDataError, RowConverter, check_links,
+                        read_batches)
+from .models import ImportRecord
+
+UPSERT_VENDORS = ('sqlite', 'postgresql')
+DELETE_BATCH_SIZE = 1000
+
+
+def row_digest(row):
+    return hashlib.md5('\x1f'.join(row).encode('utf-8')).hexdigest()
+
+
+def upsert_sql(table, fields, update_fields, conflict_fields, db=connection):
+    """INSERT ... ON CONFLICT DO UPDATE, общий для SQLite и PostgreSQL."""
+    quote = db.ops.quote_name
+    return (
+        'INSERT INTO {} ({}) VALUES ({}) ON CONFLICT ({}) '
+        'DO UPDATE SET {}'
+    ).format(
+        quote(table),
+        ', '.join(quote(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields)),
+        ', '.join(quote(field.column) for field in conflict_fields),
+        ', '.join(
+            '{0} = EXCLUDED.{0}'.format(quote(field.column))
+            for field in update_fields
+        ),
+    )
+
+
+class Upsert:
+    """
+    Инкрементальная загрузка по колонке `id`: хеш содержимого каждой
+    строки сравнивается с сохранённым при прошлом импорте, и в базу
+    пишутся только новые и изменённые строки. Колонки, которых нет
+    в CSV, при обновлении не трогаются. Id увиденных строк копятся
+    в битовых картах, чтобы удалить пропавшие из выгрузки.
+    Строки, нарушающие ограничения уникальности (slug, username,
+    отзыв автора на произведение), пишутся в rejects с причиной,
+    а без rejects прерывают загрузку ImportDataError.
+    """
+
+    def __init__(self, db=connection, rejects=None):
+        if db.vendor not in UPSERT_VENDORS:
+            raise NotSupportedError(
+                'Инкрементальная загрузка поддерживается только для '
+                'SQLite и PostgreSQL.'
+            )
+        self.db = db
+        self.rejects = rejects
+        self.seen = {}
+        self.written = Counter()
+        self.skipped = Counter()
+        self.deleted = Counter()
+        self.rejected = Counter()
+
+    def see(self, table, header, rows):
+        """
+        Отмечает id строк файла без проверки: строка, которую затем
+        отклонит валидатор, не считается пропавшей и не удаляется.
+        """
+        id_index = header.index('id')
+        self.seen.setdefault(table.name, IdSet()).update(
+            int(row[id_index]) for row in rows
+            if len(row) > id_index and row[id_index].isdigit()
+        )
+
+    def scan(self, table, path):
+        """Отмечает id всех строк файла таблицы, не записывая их."""
+        for header, rows, _ in read_batches(path):
+            self.see(table, header, rows)
+
+    def write(self, table, header, rows, check=True):
+        id_index = header.index('id')
+        ids = [int(row[id_index]) for row in rows]
+        digests = [row_digest(row) for row in rows]
+        known = dict(ImportRecord.objects.filter(
+            table=table.name, row_id__in=ids
+        ).values_list('row_id', 'digest'))
+        self.seen.setdefault(table.name, IdSet()).update(ids)
+        changed = [
+            index for index, (row_id, digest) in enumerate(zip(ids, digests))
+            if known.get(row_id) != digest
+        ]
+        self.skipped[table.name] += len(rows) - len(changed)
+        if not changed:
+            return
+        conflicts = self.write_rows(
+            table.model, header, [rows[index] for index in changed], check
+        )
+        if conflicts:
+            self.reject(table, header, conflicts)
+            failed = {id(row) for row, _ in conflicts}
+            changed = [
+                index for index in changed if id(rows[index]) not in failed
+            ]
+        self.record(
+            table.name, [(ids[index], digests[index]) for index in changed]
+        )
+        self.written[table.name] += len(changed)
+
+    def write_rows(self, model, header, rows, check=True):
+        """
+        Пишет строки одним executemany в точке сохранения. Если пачка
+        нарушает ограничение уникальности, строки пишутся по одной,
+        и возвращается список (строка, ошибка) для не записанных.
+        check=False — ссылки строк уже проверены валидатором.
+        """
+        converter = RowConverter(model, header, self.db)
+        update_fields = [
+            field for field, column in zip(
+                converter.fields, converter.columns
+            )
+            if column is not None and not field.primary_key
+        ]
+        sql = upsert_sql(
+            model._meta.db_table, converter.fields, update_fields,
+            [model._meta.pk], self.db
+        )
+        values = converter(rows)
+        if check and model._meta.auto_created:
+            check_links(model, values, self.db)
+        try:
+            with transaction.atomic(using=self.db.alias), \
+                    self.db.cursor() as cursor:
+                cursor.executemany(sql, values)
+            return []
+        except IntegrityError:
+            pass
+        conflicts = []
+        with self.db.cursor() as cursor:
+            for row, value in zip(rows, values):
+                try:
+                    with transaction.atomic(using=self.db.alias):
+                        cursor.execute(sql, value)
+                except IntegrityError as error:
+                    conflicts.append((row, str(error)))
+        return conflicts
+
+    def reject(self, table, header, conflicts):
+        if self.rejects is None:
+            row, error = conflicts[0]
+            raise ImportDataError(
+                f'Строка {",".join(row)} таблицы {table.name} нарушает '
+                f'ограничение уникальности: {error}.'
+            )
+        self.rejected[table.name] += len(conflicts)
+        self.rejects.write(table.name, header, [
+            (row, f'конфликт уникальности: {error}')
+            for row, error in conflicts
+        ])
+
+    def record(self, table, digests):
+        fields = [
+            ImportRecord._meta.get_field(name)
+            for name in ('table', 'row_id', 'digest')
+        ]
+        sql = upsert_sql(
+            ImportRecord._meta.db_table, fields, fields[2:], fields[:2],
+            self.db
+        )
+        with self.db.cursor() as cursor:
+            cursor.executemany(sql, [
+                (table, row_id, digest) for row_id, digest in digests
+            ])
+
+    def delete_missing(self, table):
+        """
+        Удаляет строки, загруженные прошлыми импортами, но отсутствующие
+        в текущем. Строки, созданные не импортом, не затрагиваются.
+        Вызывается после scan и до записи: иначе строка, чей slug
+        перешёл к новому id, столкнулась бы со старой.
+        """
+        seen = self.seen.get(table.name, IdSet())
+        records = ImportRecord.objects.filter(table=table.name)
+        stale = [
+            row_id
+            for row_id in records.values_list('row_id', flat=True).iterator()
+            if row_id not in seen
+        ]
+        for start in range(0, len(stale), DELETE_BATCH_SIZE):
+            batch = stale[start:start + DELETE_BATCH_SIZE]
+            with transaction.atomic(using=self.db.alias):
+                table.model.objects.filter(pk__in=batch).delete()
+                records.filter(row_id__in=batch).delete()
+        self.deleted[table.name] += len(stale)
@@ -0,0 +1,168 @@
+import csv
+import os
+from collections import Counter
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+
+from .importers import TABLES, IdSet
+
+REJECTS_PATH = 'rejects/'
+REASON_COLUMN = 'reject_reason'
+
+
+class RejectFiles:
+    """
+    Отклонённые строки по таблицам: `<таблица>.csv` в каталоге path
+    с колонками исходного файла и причиной отказа. Файлы создаются
+    при первой отклонённой строке; при продолжении загрузки
+    дописываются, иначе остатки прошлого запуска удаляются.
+    """
+
+    def __init__(self, path=REJECTS_PATH, resume=False):
+        self.path = path
+        self.resume = resume
+        self.files = {}
+        self.writers = {}
+        if resume:
+            return
+        for table in TABLES:
+            previous = self.table_path(table.name)
+            if os.path.exists(previous):
+                os.remove(previous)
+
+    def table_path(self, table):
+        return os.path.join(self.path, f'{table}.csv')
+
+    def writer(self, table, header):
+        if table not in self.writers:
+            os.makedirs(self.path, exist_ok=True)
+            path = self.table_path(table)
+            append = self.resume and os.path.exists(path)
+            self.files[table] = open(
+                path, 'a' if append else 'w', encoding='utf-8', newline=''
+            )
+            self.writers[table] = csv.writer(self.files[table])
+            if not append:
+                self.writers[table].writerow([*header, REASON_COLUMN])
+        return self.writers[table]
+
+    def write(self, table, header, rejects):
+        self.writer(table, header).writerows(
+            [*row, reason] for row, reason in rejects
+        )
+
+    def close(self):
+        for file in self.files.values():
+            file.close()
+        self.files = {}
+        self.writers = {}
+
+
+class BatchValidator:
+    """
+    Проверка пачек строк перед записью: значения проходят преобразование
+    и валидаторы полей модели (диапазон оценки, год, slug, правила
+    username, choices, длина), а внешние ключи сверяются с битовыми
+    картами id связанных таблиц. Карта таблицы читается из базы одним
+    запросом при первой ссылке на неё: таблицы загружаются в порядке
+    зависимостей, и к этому моменту связанная таблица уже загружена.
+    Отклонённые строки пишутся в rejects с причиной, загрузка идёт дальше.
+    """
+
+    def __init__(self, rejects=None, db=connection, ids=None):
+        self.rejects = rejects
+        self.db = db
+        self.ids = dict(ids or {})
+        self.checks = {}
+        self.rejected = Counter()
+
+    def known_ids(self, model):
+        if model not in self.ids:
+            self.ids[model] = IdSet(
+                model.objects.using(self.db.alias).values_list(
+                    'pk', flat=True
+                ).iterator()
+            )
+        return self.ids[model]
+
+    def table_checks(self, table, header):
+        key = (table.name, tuple(header))
+        if key not in self.checks:
+            self.checks[key] = [
+                (index, table.model._meta.get_field(column))
+                for index, column in enumerate(header)
+            ]
+        return self.checks[key]
+
+    def check_link(self, field, value):
+        if value == '' and field.null:
+            return
+        target = field.target_field.to_python(value)
+        if target < 1 or target not in self.known_ids(field.related_model):
+            raise ValidationError(
+                f'нет объекта {field.related_model._meta.model_name} '
+                f'с id {value}'
+            )
+
+    @staticmethod
+    def check_id(field, value):
+        if field.clean(value, None) < 1:
+            raise ValidationError(f'id должен быть положительным: {value}')
+
+    def reason(self, checks, row):
+        if len(row) > len(checks):
+            return f'ожидалось колонок: {len(checks)}, получено: {len(row)}'
+        for index, field in checks:
+            # Недостающие в конце строки значения CSV считаются пустыми.
+            value = row[index] if index < len(row) else ''
+            try:
+                if field.is_relation:
+                    self.check_link(field, value)
+                elif field.primary_key:
+                    self.check_id(field, value)
+                else:
+                    field.clean(value, None)
+            except ValidationError as error:
+                return f'{field.name}: {" ".join(error.messages)}'
+        return None
+
+    def level_ids(self, tables):
+        """
+        Битовые карты id всех таблиц, на которые ссылаются tables:
+        передаются процессам пула, чтобы проверка шла в них.
+        """
+        return {
+            field.related_model: self.known_ids(field.related_model)
+            for table in tables
+            for field in table.model._meta.concrete_fields
+            if field.is_relation
+        }
+
+    def check(self, table, header, rows):
+        """Строки пачки, прошедшие проверку, и список (строка, причина)."""
+        checks = self.table_checks(table, header)
+        valid = []
+        rejects = []
+        for row in rows:
+            reason = self.reason(checks, row)
+            if reason is None:
+                valid.append(row)
+            else:
+                rejects.append((row, reason))
+        return valid, rejects
+
+    def record(self, table, header, rejects):
+        if rejects:
+            self.rejected[table.name] += len(rejects)
+            if self.rejects is not None:
+                self.rejects.write(table.name, header, rejects)
+
+    def split(self, table, header, rows):
+        """
+        Возвращает строки пачки, прошедшие проверку; остальные вместе
+        с причиной уходят в файл отказов.
+        """
+        valid, rejects = self.check(table, header, rows)
+        self.record(table, header, rejects)
+        return valid
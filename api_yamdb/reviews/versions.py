@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import CollectionVersion
+
+# Общая версия всего каталога: сдвигается при массовой загрузке,
+# которая обходит сигналы моделей.
+CATALOGUE = 'catalogue'
+TITLES = 'titles'
+GENRES = 'genres'
+CATEGORIES = 'categories'
+
+INVALIDATIONS_COUNTER = 'catalogue:stats:invalidations'
+
+
+def title_key(title_id):
+    return f'title:{title_id}'
+
+
+def reviews_key(title_id):
+    return f'reviews:{title_id}'
+
+
+def comments_key(review_id):
+    return f'comments:{review_id}'
+
+
+def bump_versions(*keys):
+    """
+    Увеличивает версии коллекций после фиксации текущей транзакции,
+    чтобы закэшированные по старым версиям ответы больше не читались.
+    """
+    transaction.on_commit(lambda: _bump_versions(keys))
+
+
+def _bump_versions(keys):
+    now = timezone.now()
+    updated = CollectionVersion.objects.filter(key__in=keys).update(
+        version=F('version') + 1,
+        modified=now,
+    )
+    if updated < len(keys):
+        CollectionVersion.objects.bulk_create(
+            [CollectionVersion(key=key, version=1, modified=now)
+             for key in keys],
+            ignore_conflicts=True
+        )
+    cache.add(INVALIDATIONS_COUNTER, 0, timeout=None)
+    cache.incr(INVALIDATIONS_COUNTER)
+
+
+def get_versions(keys):
+    """
+    Возвращает {ключ: (версия, дата изменения)} одним запросом.
+    Для ещё не менявшихся коллекций версия равна 0.
+    """
+    versions = {key: (0, None) for key in keys}
+    versions.update(
+        (key, (version, modified))
+        for key, version, modified in CollectionVersion.objects.filter(
+            key__in=keys
+        ).values_list('key', 'version', 'modified')
+    )
+    return versions
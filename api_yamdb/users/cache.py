@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from .models import User
+
+CACHE_PREFIX = 'users'
+MISSING = -1
+PROCESS_LOCAL_CACHES = ('django.core.cache.backends.locmem.LocMemCache',)
+# Поля, которых хватает проверкам прав и users/me. Хеш пароля и прочие
+# поля в кэш не попадают: у пользователя из кэша они отложены
+# и читаются из базы при обращении.
+CACHED_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'bio', 'role',
+    'is_superuser', 'is_staff', 'is_active', 'token_version',
+)
+
+
+def user_cache_key(user_id):
+    return f'{CACHE_PREFIX}:user:{user_id}'
+
+
+def token_version_key(user_id):
+    return f'{CACHE_PREFIX}:token_version:{user_id}'
+
+
+def shared_cache():
+    """Кэш общий для всех процессов сервера, а не в памяти процесса."""
+    return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES
+
+
+def user_cache_enabled():
+    """
+    Пользователи кэшируются только в общем кэше: сброс при сохранении
+    должен дойти до всех процессов, иначе разжалованный или удалённый
+    пользователь проходил бы аутентификацию в других до истечения
+    USER_CACHE_TIMEOUT. Настройку на кэше процесса отклоняет api.E001.
+    """
+    return settings.USER_CACHE_TIMEOUT > 0 and shared_cache()
+
+
+def get_cached_user(user_id):
+    if not user_cache_enabled():
+        return None
+    fields = cache.get(user_cache_key(user_id))
+    if fields is None:
+        return None
+    # from_db ждёт значения в порядке полей модели.
+    names = [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in fields
+    ]
+    return User.from_db(
+        DEFAULT_DB_ALIAS, names, [fields[name] for name in names]
+    )
+
+
+def cache_user(user):
+    if user_cache_enabled():
+        cache.set(
+            user_cache_key(user.pk),
+            {field: getattr(user, field) for field in CACHED_FIELDS},
+            settings.USER_CACHE_TIMEOUT
+        )
+
+
+def get_token_version(user_id):
+    """
+    Текущая версия токенов активного пользователя или None, если его
+    нет или он отключён. Хранится в кэше TOKEN_VERSION_CACHE_TIMEOUT
+    секунд; forget_user сбрасывает её для всех процессов только при
+    общем кэше, что требует проверка api.E001.
+    """
+    key = token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id, is_active=True
+        ).values_list('token_version', flat=True).first()
+        version = MISSING if version is None else version
+        cache.set(key, version, settings.TOKEN_VERSION_CACHE_TIMEOUT)
+    return None if version == MISSING else version
+
+
+def forget_user(user_id):
+    cache.delete_many([user_cache_key(user_id), token_version_key(user_id)])
@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from users.outbox import send_batch
+
+
+class Command(BaseCommand):
+    help = "Sends queued emails from the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.OUTBOX_BATCH_SIZE,
+            help='Число писем на одно соединение с почтовым сервером.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval с.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1,
+            help='Пауза между проверками очереди в режиме --loop.'
+        )
+
+    def drain(self, batch_size):
+        """Отправляет пачки, пока есть письма с наступившим сроком."""
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_batch(batch_size)
+            total_sent += sent
+            total_failed += failed
+            if sent + failed < batch_size:
+                return total_sent, total_failed
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = self.drain(options['batch_size'])
+            if sent or failed or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Отправлено писем: {sent}, ошибок: {failed}'
+                ))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
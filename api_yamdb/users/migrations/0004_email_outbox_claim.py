@@ -0,0 +1,25 @@
+# Generated by Django 3.2 on 2026-10-18 13:03
+
+from django.db import migrations, models
+
+
+def clear_sent_bodies(apps, schema_editor):
+    # Тексты отправленных писем содержат коды подтверждения.
+    EmailOutbox = apps.get_model('users', 'EmailOutbox')
+    EmailOutbox.objects.filter(sent__isnull=False).update(body='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='claim',
+            field=models.UUIDField(blank=True, null=True, verbose_name='Метка отправляющего процесса'),
+        ),
+        migrations.RunPython(clear_sent_bodies, migrations.RunPython.noop),
+    ]
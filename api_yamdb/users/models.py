@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 
 from api.v1.validators import me_forbidden, username_symbols
 
@@ -37,6 +38,20 @@ class User(AbstractUser):
         blank=True,
         verbose_name='Информация о пользователе'
     )
+    token_version = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Версия токенов'
+    )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._claims = instance.token_claims()
+        return instance
+
+    def token_claims(self):
+        """Поля, которые подписываются в токен доступа."""
+        return (self.role, self.is_superuser, self.is_active)
 
     @property
     def is_moderator(self):
@@ -50,3 +65,56 @@ class User(AbstractUser):
         ordering = ['username']
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+
+
+class EmailOutbox(models.Model):
+    recipient = models.EmailField(
+        verbose_name='Получатель'
+    )
+    subject = models.CharField(
+        max_length=settings.NAME_SYM_LIMIT,
+        verbose_name='Тема'
+    )
+    body = models.TextField(
+        verbose_name='Текст письма'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата постановки в очередь'
+    )
+    send_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Отправить не раньше'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток отправки'
+    )
+    sent = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата отправки'
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+    claim = models.UUIDField(
+        null=True,
+        blank=True,
+        verbose_name='Метка отправляющего процесса'
+    )
+
+    class Meta:
+        ordering = ['send_after']
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        indexes = [
+            models.Index(
+                fields=('sent', 'send_after'),
+                name='email_outbox_due_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
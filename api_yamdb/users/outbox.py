@@ -0,0 +1,133 @@
+import smtplib
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Avg, DurationField, ExpressionWrapper, F, Max, Min
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+LATENCY_WINDOW = timedelta(hours=1)
+
+
+def enqueue_email(subject, message, recipient):
+    """Ставит письмо в очередь; отправит его команда sendoutbox."""
+    return EmailOutbox.objects.create(
+        recipient=recipient, subject=subject, body=message
+    )
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка перед повторной отправкой: 1, 2, 4... раз."""
+    return timedelta(seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def pending():
+    return EmailOutbox.objects.filter(
+        sent__isnull=True, attempts__lt=settings.OUTBOX_MAX_ATTEMPTS
+    )
+
+
+def defer(message, error):
+    message.attempts += 1
+    message.send_after = timezone.now() + retry_delay(message.attempts)
+    message.error = str(error)
+    if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        message.body = ''
+    message.save(update_fields=('attempts', 'send_after', 'error', 'body'))
+
+
+def claim(batch_size):
+    """
+    Забирает до batch_size писем с наступившим сроком одним условным
+    UPDATE: письмо получает метку процесса и срок OUTBOX_CLAIM_TIMEOUT,
+    поэтому другой sendoutbox его не возьмёт, а после падения
+    процесса письмо вернётся в очередь по истечении срока.
+    """
+    now = timezone.now()
+    due = list(pending().filter(send_after__lte=now).values_list(
+        'pk', flat=True
+    )[:batch_size])
+    token = uuid.uuid4()
+    pending().filter(pk__in=due, send_after__lte=now).update(
+        claim=token,
+        send_after=now + timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT),
+    )
+    return list(EmailOutbox.objects.filter(pk__in=due, claim=token))
+
+
+def mark_sent(message):
+    """Отмечает письмо отправленным и стирает текст с кодом подтверждения."""
+    EmailOutbox.objects.filter(pk=message.pk).update(
+        sent=timezone.now(), attempts=F('attempts') + 1, error='', body=''
+    )
+
+
+def send_batch(batch_size=None, connection=None):
+    """
+    Отправляет до batch_size писем, срок которых наступил, через одно
+    соединение с почтовым сервером. Письма сначала забираются claim,
+    а отправленными отмечаются по одному сразу после отправки.
+    Неудачные письма откладываются с растущей задержкой, после
+    OUTBOX_MAX_ATTEMPTS попыток остаются в таблице с последней
+    ошибкой. Возвращает (отправлено, ошибок).
+    """
+    messages = claim(batch_size or settings.OUTBOX_BATCH_SIZE)
+    if not messages:
+        return 0, 0
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except (smtplib.SMTPException, OSError) as error:
+        for message in messages:
+            defer(message, error)
+        return 0, len(messages)
+    sent = 0
+    try:
+        for message in messages:
+            try:
+                connection.send_messages([EmailMessage(
+                    subject=message.subject,
+                    body=message.body,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[message.recipient],
+                )])
+            except (smtplib.SMTPException, OSError) as error:
+                defer(message, error)
+            else:
+                mark_sent(message)
+                sent += 1
+    finally:
+        connection.close()
+    return sent, len(messages) - sent
+
+
+def outbox_stats():
+    """Глубина очереди и задержка доставки писем за последний час."""
+    now = timezone.now()
+    queue = pending().aggregate(oldest=Min('created'))
+    latency = EmailOutbox.objects.filter(
+        sent__gte=now - LATENCY_WINDOW
+    ).annotate(latency=ExpressionWrapper(
+        F('sent') - F('created'), output_field=DurationField()
+    )).aggregate(avg=Avg('latency'), max=Max('latency'))
+    return {
+        'pending': pending().count(),
+        'failed': EmailOutbox.objects.filter(
+            sent__isnull=True, attempts__gte=settings.OUTBOX_MAX_ATTEMPTS
+        ).count(),
+        'oldest_pending_seconds': (
+            None if queue['oldest'] is None
+            else round((now - queue['oldest']).total_seconds(), 3)
+        ),
+        'avg_delivery_seconds': (
+            None if latency['avg'] is None
+            else round(latency['avg'].total_seconds(), 3)
+        ),
+        'max_delivery_seconds': (
+            None if latency['max'] is None
+            else round(latency['max'].total_seconds(), 3)
+        ),
+    }
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import forget_user
+from .models import User
+
+
+@receiver(pre_save, sender=User)
+def bump_token_version(sender, instance, **kwargs):
+    """
+    Смена роли, прав суперпользователя или активности делает выданные
+    токены с прежними правами недействительными.
+    """
+    claims = instance.token_claims()
+    if getattr(instance, '_claims', claims) != claims:
+        instance.token_version += 1
+    instance._claims = claims
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """
+    Любое сохранение пользователя, в том числе смена роли в админке
+    и PATCH через API, убирает его из кэша аутентификации.
+    """
+    forget_user(instance.pk)
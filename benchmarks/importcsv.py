@@ -0,0 +1,119 @@
+"""
+Скорость загрузки отзывов: прежний get_or_create на каждую строку
+против пакетной вставки reviews.importers.load_table и параллельного
+разбора reviews.importers.load_level.
+
+    python benchmarks/importcsv.py --reviews 200000
+"""
+import argparse
+import csv
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utils import setup_django
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def generate(data_path, reviews, seed):
+    rng = random.Random(seed)
+    users = max(reviews // 20, 1)
+    titles = max(reviews // users + 1, 1)
+    write_csv(
+        data_path / 'users.csv',
+        ('id', 'username', 'email', 'role', 'bio', 'first_name',
+         'last_name'),
+        ((idx, f'user{idx}', f'user{idx}@yamdb.fake', 'user', '', '', '')
+         for idx in range(1, users + 1))
+    )
+    write_csv(data_path / 'category.csv', ('id', 'name', 'slug'),
+              [(1, 'Книга', 'book')])
+    write_csv(
+        data_path / 'titles.csv',
+        ('id', 'name', 'year', 'category'),
+        ((idx, f'Произведение {idx}', rng.randint(1900, 2023), 1)
+         for idx in range(1, titles + 1))
+    )
+    write_csv(
+        data_path / 'review.csv',
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        ((idx, idx // users + 1, f'Отзыв {idx}', idx % users + 1,
+          rng.randint(1, 10), '2020-01-13T23:20:02.422Z')
+         for idx in range(reviews))
+    )
+
+
+def legacy_load(path, limit):
+    from reviews.models import Review
+
+    with open(path, encoding='utf-8') as csvfile:
+        for idx, row in enumerate(csv.DictReader(csvfile)):
+            if idx == limit:
+                return idx
+            Review.objects.get_or_create(
+                title_id=row['title_id'],
+                text=row['text'],
+                author_id=row['author'],
+                score=row['score'],
+                pub_date=row['pub_date'])
+    return idx + 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--reviews', type=int, default=100000)
+    parser.add_argument('--legacy-rows', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+    from reviews.importers import (TABLES, Checkpoint, fast_load, init_worker,
+                                   load_level, load_table)
+    from reviews.models import Review
+
+    data_path = Path(tempfile.mkdtemp())
+    generate(data_path, args.reviews, args.seed)
+    tables = {table.name: table for table in TABLES}
+    for name in ('users', 'category', 'titles'):
+        load_table(tables[name], data_path / f'{name}.csv')
+
+    start = time.perf_counter()
+    rows = legacy_load(data_path / 'review.csv', args.legacy_rows)
+    legacy = rows / (time.perf_counter() - start)
+    Review.objects.all().delete()
+
+    start = time.perf_counter()
+    with fast_load():
+        rows = load_table(tables['review'], data_path / 'review.csv')
+    bulk = rows / (time.perf_counter() - start)
+
+    Review.objects.all()._raw_delete(Review.objects.db)
+    sources = {'review': data_path / 'review.csv'}
+    start = time.perf_counter()
+    with fast_load(), ProcessPoolExecutor(
+        args.workers, initializer=init_worker
+    ) as pool:
+        rows = load_level(
+            [tables['review']], sources, pool, args.workers, Checkpoint()
+        )['review']
+    parallel = rows / (time.perf_counter() - start)
+
+    print(f'get_or_create: {legacy:12.0f} строк/с')
+    print(f'load_table:    {bulk:12.0f} строк/с ({bulk / legacy:.0f}x)')
+    print(
+        f'load_level:    {parallel:12.0f} строк/с '
+        f'({parallel / legacy:.0f}x, процессов: {args.workers})'
+    )
+
+
+if __name__ == '__main__':
+    main()
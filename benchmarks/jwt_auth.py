@@ -0,0 +1,69 @@
+"""
+Стоимость JWT-аутентификации запроса: CachedJWTAuthentication.authenticate
+с проверкой подписи на каждый запрос против кэша проверенных токенов
+api.v1.authentication.token_cache.
+
+    python benchmarks/jwt_auth.py --tokens 100 --requests 10000
+"""
+import argparse
+import random
+
+from utils import measure, report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tokens', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from api.v1.authentication import (CachedJWTAuthentication,
+                                       access_token_for, token_cache)
+    from users.models import User
+
+    User.objects.bulk_create(
+        User(username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+        for idx in range(args.tokens)
+    )
+    tokens = [str(access_token_for(user)) for user in User.objects.all()]
+    rng = random.Random(args.seed)
+    factory = APIRequestFactory()
+    requests = [
+        Request(factory.get(
+            '/', HTTP_AUTHORIZATION=f'Bearer {rng.choice(tokens)}'
+        ))
+        for _ in range(args.requests)
+    ]
+    authentication = CachedJWTAuthentication()
+
+    def authenticate():
+        for request in requests:
+            authentication.authenticate(request)
+
+    def uncached():
+        token_cache.clear()
+        token_cache.size = 0
+        authenticate()
+
+    size = token_cache.size
+    rows = [('без кэша токенов', *measure(uncached, repeat=5))]
+    token_cache.size = size
+    token_cache.clear()
+    rows.append(('token_cache', *measure(authenticate, repeat=5)))
+    report(rows)
+
+    stats = token_cache.stats()
+    print(
+        f'\nпопаданий: {stats["hit_rate"]:.1%}, сэкономлено на проверке '
+        f'подписи: {stats["saved_seconds"]:.3f} с '
+        f'из {stats["hits"] + stats["misses"]} запросов'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Сравнение фильтров /titles/ по жанру и категории: прежний поиск
+подстроки в slug (icontains) и точное совпадение через id.
+
+    python benchmarks/title_filters.py --titles 200000
+"""
+import argparse
+import random
+
+from utils import measure, report, setup_django
+
+GENRES = 30
+CATEGORIES = 10
+PAGE_SIZE = 5
+
+
+def generate_catalogue(titles, seed):
+    from reviews.models import Category, Genre, Title
+
+    rng = random.Random(seed)
+    Category.objects.bulk_create(
+        Category(name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(CATEGORIES)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(GENRES)
+    )
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    genre_ids = list(Genre.objects.values_list('id', flat=True))
+    Title.objects.bulk_create(
+        (
+            Title(
+                name=f'Произведение {rng.random():.12f}',
+                year=rng.randint(1900, 2023),
+                category_id=rng.choice(category_ids),
+            )
+            for _ in range(titles)
+        ),
+        batch_size=5000
+    )
+    through = Title.genre.through
+    through.objects.bulk_create(
+        (
+            through(title_id=title_id, genre_id=genre_id)
+            for title_id in Title.objects.values_list('id', flat=True)
+            for genre_id in rng.sample(genre_ids, rng.randint(1, 3))
+        ),
+        batch_size=5000
+    )
+
+
+def first_page(queryset):
+    return lambda: (queryset.count(), list(queryset[:PAGE_SIZE]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+    from api.v1.filters import TitlesFilter
+    from reviews.models import Title
+
+    generate_catalogue(args.titles, args.seed)
+    titles = Title.objects.order_by('name')
+    genre, category = 'genre-7', 'category-3'
+
+    def exact(params):
+        return lambda: first_page(
+            TitlesFilter(params, queryset=titles).qs
+        )()
+
+    report([
+        ('genre icontains', *measure(first_page(
+            titles.filter(genre__slug__icontains=genre)
+        ), args.repeat)),
+        ('genre exact', *measure(exact({'genre': genre}), args.repeat)),
+        ('genres any', *measure(
+            exact({'genre': 'genre-7,genre-8'}), args.repeat
+        )),
+        ('genres all', *measure(exact({
+            'genre': 'genre-7,genre-8', 'genre_match': 'all'
+        }), args.repeat)),
+        ('category icontains', *measure(first_page(
+            titles.filter(category__slug__icontains=category)
+        ), args.repeat)),
+        ('category exact', *measure(
+            exact({'category': category}), args.repeat
+        )),
+    ])
+
+
+if __name__ == '__main__':
+    main()
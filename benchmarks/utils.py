@@ -0,0 +1,47 @@
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+
+
+def setup_django(db_path=None):
+    """
+    Настраивает Django на отдельную базу SQLite, чтобы замеры
+    не трогали рабочую db.sqlite3, и применяет миграции.
+    """
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+    from django.conf import settings
+
+    if db_path is None:
+        db_path = Path(tempfile.mkdtemp()) / 'benchmark.sqlite3'
+    settings.DATABASES['default']['NAME'] = str(db_path)
+    settings.DEBUG = False
+    django.setup()
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    return db_path
+
+
+def measure(func, repeat=20):
+    """Медиана и минимум времени выполнения func в миллисекундах."""
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), min(timings)
+
+
+def report(rows):
+    width = max(len(name) for name, _, _ in rows)
+    print(f'{"":{width}}  median, ms     min, ms')
+    for name, median, best in rows:
+        print(f'{name:{width}}  {median:10.2f}  {best:10.2f}')
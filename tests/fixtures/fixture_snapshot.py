@@ -0,0 +1,42 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from reviews.snapshots import restore_snapshot, save_snapshot
+
+DATA_PATH = Path(__file__).resolve().parents[2] / 'api_yamdb/static/data'
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--db-snapshot',
+        default=None,
+        help=(
+            'Снимок базы (manage.py dbsnapshot save) для фикстуры '
+            'catalogue_snapshot; по умолчанию снимок собирается из '
+            'static/data один раз за запуск.'
+        )
+    )
+
+
+@pytest.fixture(scope='session')
+def catalogue_snapshot_path(request, django_db_setup, django_db_blocker,
+                            tmp_path_factory):
+    path = request.config.getoption('--db-snapshot')
+    if path:
+        return path
+    path = str(tmp_path_factory.mktemp('snapshots') / 'catalogue.sqlite3')
+    with django_db_blocker.unblock():
+        call_command('importcsv', '--path', str(DATA_PATH),
+                     '--checkpoint', '', stdout=StringIO())
+        save_snapshot(path)
+        call_command('flush', interactive=False, verbosity=0)
+    return path
+
+
+@pytest.fixture
+def catalogue_snapshot(catalogue_snapshot_path, transactional_db):
+    """Тест начинается с базы, восстановленной из снимка каталога."""
+    restore_snapshot(catalogue_snapshot_path)
@@ -5,7 +5,8 @@ from django.core import mail
 from django.db.utils import IntegrityError
 
 from tests.utils import (invalid_data_for_user_patch_and_creation,
-                         invalid_data_for_username_and_email_fields)
+                         invalid_data_for_username_and_email_fields,
+                         send_outbox)
 
 
 @pytest.mark.django_db(transaction=True)
@@ -110,6 +111,7 @@ class Test00UserRegistration:
         }
 
         response = client.post(self.url_signup, data=valid_data)
+        send_outbox()
         outbox_after = mail.outbox  # email outbox after user create
 
         assert response.status_code != HTTPStatus.NOT_FOUND, (
@@ -159,6 +161,7 @@ class Test00UserRegistration:
         response = admin_client.post(
             self.url_admin_create_user, data=valid_data
         )
+        send_outbox()
         outbox_after = mail.outbox
 
         assert response.status_code != HTTPStatus.NOT_FOUND, (
@@ -0,0 +1,157 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, admin_client,
+                                              user_client, client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+
+        create_single_review(admin_client, title_id, 'Отлично', 10)
+        response = create_single_review(user_client, title_id, 'Так себе', 4)
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        review_id = response.json()['id']
+        response = user_client.patch(f'{url}{review_id}/', data={'score': 8})
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 9, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки отзыва.'
+        )
+
+        response = user_client.delete(f'{url}{review_id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 10, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+        assert self.get_rating(client, titles[1]['id']) is None, (
+            'Проверьте, что у произведения без отзывов рейтинг равен `None`.'
+        )
+
+    def test_02_rebuild_ratings_command(self, admin_client, client):
+        from reviews.models import Title, TitleScore
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Неплохо', 6)
+        Title.objects.update(score_sum=0, review_count=0)
+        TitleScore.objects.all().delete()
+
+        call_command('rebuildratings')
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что команда `rebuildratings` восстанавливает '
+            'рейтинг произведений по отзывам.'
+        )
+        response = client.get(
+            f'/api/v1/titles/{title_id}/rating-distribution/'
+        )
+        assert response.json()['distribution']['6'] == 1, (
+            'Проверьте, что команда `rebuildratings` восстанавливает '
+            'счётчики оценок произведений.'
+        )
+
+    def test_03_rating_distribution(self, admin_client, user_client,
+                                    moderator_client, client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/rating-distribution/'
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        assert response.json() == {
+            'count': 0,
+            'mean': None,
+            'distribution': {str(score): 0 for score in range(1, 11)},
+        }
+
+        create_single_review(admin_client, title_id, 'Отлично', 10)
+        create_single_review(moderator_client, title_id, 'Хорошо', 7)
+        response = create_single_review(user_client, title_id, 'Плохо', 2)
+        review_id = response.json()['id']
+        user_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/',
+            data={'score': 7}
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        data = response.json()
+        expected = {str(score): 0 for score in range(1, 11)}
+        expected.update({'7': 2, '10': 1})
+        assert data['distribution'] == expected, (
+            f'Проверьте, что `{url}` возвращает количество отзывов с каждой '
+            'оценкой с учётом изменения оценок.'
+        )
+        assert data['count'] == 3 and data['mean'] == 8.0
+        assert not any(
+            'reviews_review' in query['sql']
+            for query in context.captured_queries
+        ), (
+            f'Проверьте, что `{url}` не обращается к таблице отзывов.'
+        )
+
+        user_client.delete(f'/api/v1/titles/{title_id}/reviews/{review_id}/')
+        data = client.get(url).json()
+        assert data['distribution']['7'] == 1 and data['count'] == 2, (
+            f'Проверьте, что `{url}` учитывает удаление отзывов.'
+        )
+
+    def test_04_rating_ignores_stale_instances(self, admin_client,
+                                               user_client, client):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Отлично', 10)
+        response = create_single_review(user_client, title_id, 'Плохо', 2)
+        review_id = response.json()['id']
+
+        first = Review.objects.get(pk=review_id)
+        second = Review.objects.get(pk=review_id)
+        first.score = 6
+        first.save()
+        second.score = 4
+        second.save()
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что прежняя оценка отзыва читается из базы при '
+            'сохранении, а не берётся из загруженного ранее объекта.'
+        )
+
+        detached = Review(
+            pk=review_id, title_id=title_id, author_id=second.author_id,
+            text='Сносно', score=8, pub_date=second.pub_date
+        )
+        detached.save()
+        assert self.get_rating(client, title_id) == 9, (
+            'Проверьте, что сохранение отзыва с существующим `id` не '
+            'учитывает его оценку повторно.'
+        )
+
+        first.delete()
+        assert self.get_rating(client, title_id) == 10, (
+            'Проверьте, что при удалении отзыва из рейтинга убирается '
+            'сохранённая в базе оценка.'
+        )
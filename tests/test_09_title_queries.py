@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+    url = '/api/v1/titles/'
+
+    def create_titles(self, count):
+        from reviews.models import Category, Genre, Title
+
+        categories = list(Category.objects.all())
+        genres = list(Genre.objects.all())
+        for idx in range(count):
+            title = Title.objects.create(
+                name=f'Произведение {idx}',
+                year=2000,
+                category=categories[idx % len(categories)]
+            )
+            title.genre.set(genres)
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(context.captured_queries)
+
+    def test_01_title_list_queries(self, admin_client, client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        self.create_titles(1)
+        single = self.count_queries(client, self.url)
+        self.create_titles(4)
+        full_page = self.count_queries(client, self.url)
+        assert single == full_page, (
+            f'Проверьте, что GET-запрос к `{self.url}` выполняет одинаковое '
+            'число запросов к базе данных независимо от количества '
+            'произведений на странице.'
+        )
+
+    def test_02_title_detail_queries(self, admin_client, client):
+        from api.v1.serializers import CreateUpdateTitleSerializer
+        from reviews.models import Title
+
+        create_genre(admin_client)
+        create_categories(admin_client)
+        self.create_titles(1)
+        title = Title.objects.get()
+        url = f'{self.url}{title.id}/'
+        title.genre.clear()
+        empty = self.count_queries(client, url)
+        with CaptureQueriesContext(connection) as empty_write:
+            CreateUpdateTitleSerializer(title).data
+
+        self.create_titles(1)
+        title = Title.objects.latest('id')
+        url = f'{self.url}{title.id}/'
+        full = self.count_queries(client, url)
+        with CaptureQueriesContext(connection) as full_write:
+            CreateUpdateTitleSerializer(title).data
+
+        assert empty == full, (
+            f'Проверьте, что GET-запрос к `{self.url}{{title_id}}/` выполняет '
+            'одинаковое число запросов независимо от количества жанров.'
+        )
+        assert (
+            len(empty_write.captured_queries)
+            == len(full_write.captured_queries)
+        ), (
+            f'Проверьте, что ответ на запросы на изменение `{self.url}` '
+            'формируется за одинаковое число запросов независимо от '
+            'количества жанров.'
+        )
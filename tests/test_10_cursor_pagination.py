@@ -0,0 +1,125 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_categories, create_genre
+
+
+def walk_pages(client, url):
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` в курсорном режиме '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в курсорном режиме пагинации ответ не содержит '
+            'ключ `count`.'
+        )
+        pages.append(data)
+        url = data['next']
+    return pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    def test_01_titles_cursor_walk(self, admin_client, client):
+        from reviews.models import Title
+
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        for idx in range(12):
+            response = admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {idx % 4}',
+                'year': 2000 + idx % 2,
+                'genre': [genres[idx % 3]['slug']],
+                'category': categories[idx % 2]['slug'],
+            })
+            assert response.status_code == HTTPStatus.CREATED
+
+        url = '/api/v1/titles/'
+        pages = walk_pages(client, f'{url}?cursor=')
+        ids = [title['id'] for page in pages for title in page['results']]
+        expected = list(
+            Title.objects.order_by('name', 'id').values_list('id', flat=True)
+        )
+        assert ids == expected, (
+            f'Проверьте, что курсорная пагинация `{url}` обходит все '
+            'произведения в порядке (name, id) без пропусков и повторов.'
+        )
+        assert pages[0]['previous'] is None
+
+        response = client.get(pages[-1]['previous'])
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            title['id'] for title in pages[-2]['results']
+        ], (
+            f'Проверьте, что ссылка `previous` курсорной пагинации `{url}` '
+            'возвращает предыдущую страницу.'
+        )
+
+        pages = walk_pages(client, f'{url}?cursor=&year=2001')
+        ids = [title['id'] for page in pages for title in page['results']]
+        expected = list(
+            Title.objects.filter(year=2001).order_by(
+                'name', 'id'
+            ).values_list('id', flat=True)
+        )
+        assert ids == expected, (
+            f'Проверьте, что курсорная пагинация `{url}` работает вместе с '
+            'фильтрами.'
+        )
+
+        response = client.get(f'{url}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_reviews_and_comments_cursor_walk(self, admin, client,
+                                                 django_user_model):
+        from django.utils import timezone
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Терминатор', year=1984)
+        for idx in range(7):
+            author = django_user_model.objects.create_user(
+                username=f'reviewer{idx}', email=f'reviewer{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                title=title, author=author, text=f'Отзыв {idx}', score=5
+            )
+        review = Review.objects.first()
+        for idx in range(8):
+            Comment.objects.create(
+                review=review, author=admin, text=f'Комментарий {idx}'
+            )
+        moment = timezone.now()
+        Review.objects.filter(id__lte=review.id + 3).update(pub_date=moment)
+        Comment.objects.update(pub_date=moment)
+
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        pages = walk_pages(client, f'{url}?cursor=')
+        ids = [item['id'] for page in pages for item in page['results']]
+        expected = list(
+            title.reviews.order_by('pub_date', 'id').values_list(
+                'id', flat=True
+            )
+        )
+        assert ids == expected, (
+            f'Проверьте, что курсорная пагинация `{url}` обходит все отзывы '
+            'в порядке (pub_date, id) без пропусков и повторов.'
+        )
+
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        pages = walk_pages(client, f'{url}?cursor=')
+        ids = [item['id'] for page in pages for item in page['results']]
+        expected = list(
+            review.comments.order_by('pub_date', 'id').values_list(
+                'id', flat=True
+            )
+        )
+        assert ids == expected, (
+            f'Проверьте, что курсорная пагинация `{url}` обходит все '
+            'комментарии в порядке (pub_date, id) без пропусков и повторов.'
+        )
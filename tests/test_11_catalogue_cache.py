@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11CatalogueCache:
+    url = '/api/v1/titles/'
+
+    def test_01_repeated_list_served_from_cache(self, admin_client, client):
+        create_titles(admin_client)
+        first = client.get(self.url)
+        with CaptureQueriesContext(connection) as context:
+            second = client.get(self.url)
+        assert second.status_code == HTTPStatus.OK
+        assert second.json() == first.json()
+        assert not any(
+            'reviews_title' in query['sql']
+            for query in context.captured_queries
+        ), (
+            f'Проверьте, что повторный GET-запрос к `{self.url}` отдаётся из '
+            'кэша без запроса к таблице произведений.'
+        )
+
+        stats = admin_client.get('/api/v1/stats/')
+        assert stats.status_code == HTTPStatus.OK
+        assert stats.json()['catalogue_cache']['hits'] >= 1
+
+    def test_02_cache_invalidated_by_changes(self, admin_client,
+                                             user_client, client):
+        titles, categories, _ = create_titles(admin_client)
+        title_url = f'{self.url}{titles[0]["id"]}/'
+
+        assert client.get(self.url).json()['count'] == 2
+        assert client.get(title_url).json()['rating'] is None
+        client.get('/api/v1/genres/')
+
+        admin_client.post(self.url, data={
+            'name': 'Титаник',
+            'year': 1997,
+            'genre': [titles[0]['genre'][0]],
+            'category': categories[0]['slug'],
+        })
+        assert client.get(self.url).json()['count'] == 3, (
+            'Проверьте, что создание произведения сбрасывает кэш '
+            f'`{self.url}`.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+        assert client.get(title_url).json()['rating'] == 9, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения.'
+        )
+
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Мюзикл', 'slug': 'musical'}
+        )
+        slugs = [
+            genre['slug'] for genre in client.get('/api/v1/genres/').json()[
+                'results'
+            ]
+        ]
+        assert 'musical' in slugs, (
+            'Проверьте, что создание жанра сбрасывает кэш `/api/v1/genres/`.'
+        )
+
+        admin_client.delete(f'/api/v1/categories/{categories[0]["slug"]}/')
+        assert client.get(title_url).json()['category'] is None, (
+            'Проверьте, что удаление категории сбрасывает кэш произведений.'
+        )
+
+        stats = admin_client.get('/api/v1/stats/').json()['catalogue_cache']
+        assert stats['invalidations'] > 0 and stats['misses'] > 0
@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (create_single_comment, create_single_review,
+                         create_titles)
+
+
+def check_not_modified(client, url, table):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    etag = response.get('ETag')
+    assert etag, (
+        f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+        'заголовок `ETag`.'
+    )
+    assert response.get('Last-Modified'), (
+        f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+        'заголовок `Last-Modified`.'
+    )
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        f'Проверьте, что GET-запрос к `{url}` с совпадающим '
+        '`If-None-Match` возвращает ответ со статусом 304.'
+    )
+    assert not any(
+        f'"{table}"' in query['sql'] for query in context.captured_queries
+    ), (
+        f'Проверьте, что ответ 304 на GET-запрос к `{url}` формируется без '
+        'запроса к данным коллекции.'
+    )
+    return etag
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    def test_01_titles_etag(self, admin_client, client):
+        titles, categories, genres = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        etag = check_not_modified(client, url, 'reviews_title')
+        detail_url = f'{url}{titles[0]["id"]}/'
+        detail_etag = check_not_modified(client, detail_url, 'reviews_title')
+
+        admin_client.patch(detail_url, data={'name': 'Новое название'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после изменения произведения `{url}` '
+            'возвращает новые данные вместо ответа 304.'
+        )
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response['ETag'] != detail_etag
+
+        check_not_modified(client, '/api/v1/genres/', 'reviews_genre')
+        check_not_modified(client, '/api/v1/categories/', 'reviews_category')
+
+    def test_02_reviews_and_comments_etag(self, admin_client, user_client,
+                                          client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(
+            admin_client, title_id, 'Отлично', 10
+        ).json()
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        etag = check_not_modified(client, url, 'reviews_review')
+
+        create_single_review(user_client, title_id, 'Неплохо', 7)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после нового отзыва `{url}` возвращает новые '
+            'данные вместо ответа 304.'
+        )
+
+        create_single_comment(user_client, title_id, review['id'], 'Согласен')
+        url = f'{url}{review["id"]}/comments/'
+        etag = check_not_modified(client, url, 'reviews_comment')
+        create_single_comment(admin_client, title_id, review['id'], 'Спасибо')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после нового комментария `{url}` возвращает '
+            'новые данные вместо ответа 304.'
+        )
@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_categories, create_genre
+
+
+def create_title(admin_client, name, description):
+    data = {
+        'name': name,
+        'year': 2000,
+        'genre': ['drama'],
+        'category': 'books',
+        'description': description,
+    }
+    response = admin_client.post('/api/v1/titles/', data=data)
+    assert response.status_code == HTTPStatus.CREATED
+    return response.json()['id']
+
+
+def search(client, text):
+    response = client.get('/api/v1/titles/', {'search': text})
+    assert response.status_code == HTTPStatus.OK
+    return [title['id'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleSearch:
+
+    def test_01_search_ranked_by_relevance(self, admin_client, client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        by_description = create_title(
+            admin_client, 'Братья Карамазовы', 'Роман о ВОЙНЕ совести'
+        )
+        by_name = create_title(admin_client, 'Война и мир', 'Роман-эпопея')
+        create_title(admin_client, 'Мёртвые души', 'Поэма')
+
+        assert search(client, 'войн') == [by_name, by_description], (
+            'Проверьте, что параметр `search` ищет по названию и описанию '
+            'без учёта регистра и ставит совпадения в названии выше.'
+        )
+        assert search(client, 'войн мир') == [by_name], (
+            'Проверьте, что все слова запроса `search` должны найтись, '
+            'а каждое слово ищется как префикс.'
+        )
+        assert search(client, '!!!') == []
+
+    def test_02_search_index_follows_changes(self, admin_client, client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        title_id = create_title(admin_client, 'Идиот', 'Роман')
+        admin_client.patch(
+            f'/api/v1/titles/{title_id}/', data={'name': 'Бесы'}
+        )
+        assert search(client, 'идиот') == []
+        assert search(client, 'бесы') == [title_id], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        admin_client.delete(f'/api/v1/titles/{title_id}/')
+        assert search(client, 'бесы') == []
+
+    def test_03_search_not_paginated_by_cursor(self, client):
+        response = client.get(
+            '/api/v1/titles/', {'search': 'войн', 'cursor': ''}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что курсорная пагинация не применяется к поиску: '
+            'курсор по названию потерял бы сортировку по релевантности.'
+        )
+        assert 'cursor' in response.json()
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def filter_titles(client, **params):
+    response = client.get('/api/v1/titles/', params)
+    assert response.status_code == HTTPStatus.OK
+    return sorted(title['id'] for title in response.json()['results'])
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleFilters:
+
+    def test_01_exact_slug_filters(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        assert filter_titles(client, genre='comedy') == [titles[0]['id']]
+        assert filter_titles(client, category='books') == [titles[1]['id']]
+        assert filter_titles(client, genre='com') == [], (
+            'Проверьте, что фильтр `genre` сравнивает slug жанра точно.'
+        )
+        assert filter_titles(client, category='film') == [], (
+            'Проверьте, что фильтр `category` сравнивает slug категории '
+            'точно.'
+        )
+        assert filter_titles(client, genre__icontains='com') == [
+            titles[0]['id']
+        ]
+        assert filter_titles(client, category__icontains='film') == [
+            titles[0]['id']
+        ]
+
+    def test_02_multiple_genres(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        assert filter_titles(client, genre='comedy,drama') == [
+            first, second
+        ], (
+            'Проверьте, что фильтр `genre` со списком slug через запятую '
+            'возвращает произведения хотя бы с одним из жанров.'
+        )
+        assert filter_titles(
+            client, genre='horror,comedy', genre_match='all'
+        ) == [first]
+        assert filter_titles(
+            client, genre='comedy,drama', genre_match='all'
+        ) == [], (
+            'Проверьте, что при `genre_match=all` возвращаются только '
+            'произведения со всеми жанрами из списка.'
+        )
+        assert filter_titles(
+            client, genre='horror,unknown', genre_match='all'
+        ) == []
+        assert filter_titles(client, category='films,books') == [
+            first, second
+        ]
+        response = client.get(
+            '/api/v1/titles/', {'genre': 'drama', 'genre_match': 'some'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_all_genres_single_query(self, admin_client, client):
+        create_titles(admin_client)
+        for genres in ('horror,comedy', 'horror,comedy,drama'):
+            with CaptureQueriesContext(connection) as context:
+                client.get('/api/v1/titles/', {
+                    'genre': genres, 'genre_match': 'all'
+                })
+            title_queries = [
+                query['sql'] for query in context.captured_queries
+                if query['sql'].startswith('SELECT COUNT(*)')
+            ]
+            assert len(title_queries) == 1
+            assert (
+                title_queries[0].count('"reviews_title_genre"') == 1
+                and 'HAVING' in title_queries[0]
+            ), (
+                'Проверьте, что фильтр `genre_match=all` выполняется одним '
+                'сгруппированным подзапросом к таблице связей при любом '
+                'числе жанров.'
+            )
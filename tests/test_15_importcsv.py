@@ -0,0 +1,325 @@
+import json
+from http import HTTPStatus
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews import importers
+from reviews.models import Category, Comment, Genre, Review, Title
+
+DATA_PATH = Path(__file__).resolve().parent.parent / 'api_yamdb/static/data'
+
+
+def import_csv(*args):
+    out = StringIO()
+    call_command('importcsv', '--path', str(DATA_PATH), *args, stdout=out)
+    return out.getvalue()
+
+
+def catalogue_counts():
+    return (
+        Title.objects.count(), Review.objects.count(),
+        Comment.objects.count(), Title.genre.through.objects.count()
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ImportCsv:
+
+    def test_01_bulk_import(self, client):
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+        import_csv('--batch-size', '10')
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.isoformat() == (
+            '2019-09-24T21:08:21.567000+00:00'
+        ), (
+            'Проверьте, что `importcsv` сохраняет дату публикации из CSV.'
+        )
+        assert Comment.objects.filter(review_id=6).exists(), (
+            'Проверьте, что `importcsv` сохраняет первичные ключи из CSV.'
+        )
+        title = Title.objects.get(pk=review.title_id)
+        assert title.review_count == title.reviews.count(), (
+            'Проверьте, что после `importcsv` рейтинги произведений '
+            'пересчитаны.'
+        )
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == Title.objects.count(), (
+            'Проверьте, что после `importcsv` закэшированные ответы '
+            'каталога больше не отдаются.'
+        )
+
+    def test_02_repeated_import(self):
+        import_csv()
+        counts = catalogue_counts()
+        import_csv()
+        assert counts == catalogue_counts(), (
+            'Проверьте, что повторный `importcsv` не создаёт дубликатов.'
+        )
+
+    def test_03_resume_from_checkpoint(self, tmp_path, monkeypatch):
+        checkpoint = tmp_path / 'checkpoint.json'
+        write_rows = importers.write_rows
+        batches = []
+
+        def failing_write(table, header, rows, *args):
+            if table.name == 'review':
+                batches.append(len(rows))
+                if len(batches) == 3:
+                    raise RuntimeError('Обрыв загрузки')
+            return write_rows(table, header, rows, *args)
+
+        monkeypatch.setattr(importers, 'write_rows', failing_write)
+        with pytest.raises(RuntimeError):
+            import_csv('--batch-size', '10', '--checkpoint', str(checkpoint))
+        state = json.loads(checkpoint.read_text(encoding='utf-8'))
+        assert state['review']['rows'] == 20, (
+            'Проверьте, что `importcsv` сохраняет контрольную точку после '
+            'каждой зафиксированной пачки.'
+        )
+        assert Review.objects.count() == 20
+        monkeypatch.setattr(importers, 'write_rows', write_rows)
+
+        output = import_csv(
+            '--batch-size', '10', '--checkpoint', str(checkpoint), '--resume'
+        )
+        resumed = catalogue_counts()
+        assert 'review: 72 строк' in output
+        assert not checkpoint.exists()
+        Review.objects.all().delete()
+        import_csv()
+        assert resumed == catalogue_counts(), (
+            'Проверьте, что `importcsv --resume` дозагружает данные с '
+            'контрольной точки.'
+        )
+
+    def test_04_explicit_files(self, tmp_path):
+        reviews = tmp_path / 'reviews-dump.csv'
+        reviews.write_bytes((DATA_PATH / 'review.csv').read_bytes())
+        import_csv(
+            str(DATA_PATH / 'users.csv'), str(DATA_PATH / 'category.csv'),
+            str(DATA_PATH / 'titles.csv'), f'review={reviews}'
+        )
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 0
+        with pytest.raises(CommandError):
+            import_csv(str(reviews))
+
+    def test_05_parallel_import(self):
+        import_csv()
+        expected = catalogue_counts()
+        ratings = dict(Title.objects.values_list('id', 'score_sum'))
+        Title.objects.all().delete()
+        Category.objects.all().delete()
+        Genre.objects.all().delete()
+        import_csv('--workers', '2')
+        assert catalogue_counts() == expected, (
+            'Проверьте, что `importcsv --workers` загружает те же данные, '
+            'что и последовательная загрузка.'
+        )
+        assert dict(
+            Title.objects.values_list('id', 'score_sum')
+        ) == ratings
+
+    def test_06_chunks_keep_quoted_newlines(self, tmp_path):
+        path = tmp_path / 'review.csv'
+        path.write_text(
+            'id,text\n1,"первая\nстрока ""в кавычках""\n"\n2,вторая\n'
+            '3,"третья,\nзапись"\n',
+            encoding='utf-8'
+        )
+        header, start = importers.read_header(path)
+        rows = []
+        for chunk in importers.chunk_bounds(path, start, chunk_bytes=1):
+            rows.extend(importers.read_chunk(path, *chunk))
+        assert [row[0] for row in rows] == ['1', '2', '3'], (
+            'Проверьте, что фрагменты файла для параллельного разбора '
+            'не разрывают записи с переводами строк внутри кавычек.'
+        )
+        assert importers.table_levels()[0][0].name == 'users'
+
+    def test_07_upsert_changed_rows(self, tmp_path, admin):
+        for path in DATA_PATH.iterdir():
+            (tmp_path / path.name).write_bytes(path.read_bytes())
+        output = import_csv('--path', str(tmp_path), '--upsert')
+        assert 'записано 32, без изменений 0' in output
+        counts = catalogue_counts()
+        review = Review.objects.get(pk=1)
+        Comment.objects.create(review=review, author=admin, text='Свой')
+
+        titles = tmp_path / 'titles.csv'
+        lines = titles.read_text(encoding='utf-8').splitlines(keepends=True)
+        lines[1] = lines[1].rstrip('\n') + ',Новое описание\n'
+        lines[0] = lines[0].rstrip('\n') + ',description\n'
+        titles.write_text(''.join(lines), encoding='utf-8')
+        comments = tmp_path / 'comments.csv'
+        lines = comments.read_text(encoding='utf-8').splitlines(keepends=True)
+        comments.write_text(''.join(lines[:-1]), encoding='utf-8')
+
+        output = import_csv('--path', str(tmp_path), '--upsert', '--delete')
+        assert Title.objects.count() == counts[0], (
+            'Проверьте, что `importcsv --upsert` обновляет строки по id, '
+            'а не создаёт дубликаты.'
+        )
+        assert Title.objects.get(pk=1).description == 'Новое описание'
+        assert Title.objects.get(pk=2).description is None
+        assert 'titles: 32 строк' in output
+        assert 'записано 1, без изменений 31, удалено 0' in output, (
+            'Проверьте, что `importcsv --upsert` пишет только изменённые '
+            'строки.'
+        )
+        assert not Comment.objects.filter(pk=3).exists(), (
+            'Проверьте, что `importcsv --delete` удаляет строки, '
+            'пропавшие из файлов.'
+        )
+        assert Comment.objects.filter(text='Свой').exists(), (
+            'Проверьте, что `importcsv --delete` не удаляет строки, '
+            'созданные не импортом.'
+        )
+        assert Title.objects.get(pk=review.title_id).review_count
+
+    def test_08_genre_title_bulk(self, tmp_path):
+        import_csv()
+        links = tmp_path / 'genre_title.csv'
+        links.write_text(
+            'id,title_id,genre_id\n1,1,1\n1001,2,3\n', encoding='utf-8'
+        )
+        Title.genre.through.objects.exclude(pk=1).delete()
+        with CaptureQueriesContext(connection) as context:
+            import_csv(str(links))
+        assert sorted(
+            Title.genre.through.objects.values_list('title_id', 'genre_id')
+        ) == [(1, 1), (2, 3)], (
+            'Проверьте, что `importcsv` пропускает уже загруженные связи '
+            'жанров и произведений.'
+        )
+        assert len([
+            query for query in context.captured_queries
+            if 'reviews_title_genre' in query['sql']
+        ]) <= 2, (
+            'Проверьте, что связи жанров и произведений пишутся пачкой, '
+            'а не по одной строке.'
+        )
+
+        links.write_text(
+            'id,title_id,genre_id\n2000,1,2\n2001,99999,1\n',
+            encoding='utf-8'
+        )
+        with pytest.raises(CommandError, match='99999'):
+            import_csv(str(links), '--no-validate')
+        assert not Title.genre.through.objects.filter(pk=2000).exists()
+
+    def test_09_upsert_unique_conflicts(self, tmp_path):
+        for path in DATA_PATH.iterdir():
+            (tmp_path / path.name).write_bytes(path.read_bytes())
+        rejects = str(tmp_path / 'rejects')
+        import_csv('--path', str(tmp_path), '--upsert', '--rejects', rejects)
+        genres = tmp_path / 'genre.csv'
+        lines = genres.read_text(encoding='utf-8').splitlines()
+        genres.write_text(
+            '\n'.join([lines[0], *lines[2:], '100,Драма,drama']) + '\n',
+            encoding='utf-8'
+        )
+        output = import_csv('--path', str(tmp_path), '--upsert', '--delete',
+                            '--rejects', rejects)
+        assert Genre.objects.get(slug='drama').pk == 100, (
+            'Проверьте, что `importcsv --delete` удаляет пропавшие строки '
+            'до записи: slug может перейти к новому id.'
+        )
+        assert not Genre.objects.filter(pk=1).exists()
+        assert 'Данные из CSV успешно импортированы' in output
+
+        genres.write_text(
+            'id,name,slug\n2,Комедия,comedy\n3,Вестерн,comedy\n',
+            encoding='utf-8'
+        )
+        output = import_csv(str(genres), '--upsert', '--rejects', rejects)
+        assert 'конфликтов уникальности 1' in output, (
+            'Проверьте, что строки, нарушающие уникальность, попадают '
+            'в файл отказов, а загрузка продолжается.'
+        )
+        assert Genre.objects.get(pk=3).slug == 'western'
+        assert 'UNIQUE' in (tmp_path / 'rejects' / 'genre.csv').read_text(
+            encoding='utf-8'
+        )
+        with pytest.raises(CommandError, match='уникальности'):
+            import_csv(str(genres), '--upsert', '--no-validate')
+
+    def test_10_negative_ids(self, tmp_path):
+        genres = tmp_path / 'genre.csv'
+        genres.write_text(
+            'id,name,slug\n-3,Драма,drama\n0,Ужасы,horror\n4,Мистика,mystic\n',
+            encoding='utf-8'
+        )
+        import_csv(str(genres), '--upsert', '--rejects',
+                   str(tmp_path / 'rejects'))
+        assert list(Genre.objects.values_list('pk', flat=True)) == [4], (
+            'Проверьте, что строки с неположительным id отклоняются.'
+        )
+        with pytest.raises(ValueError):
+            importers.IdSet([8]).add(-3)
+
+    def test_11_links_checked_in_bounded_queries(self, tmp_path, monkeypatch):
+        import_csv()
+        Title.genre.through.objects.all().delete()
+        links = tmp_path / 'genre_title.csv'
+        links.write_text(
+            'id,title_id,genre_id\n1,1,1\n2,2,2\n3,3,3\n4,4,4\n5,5,5\n',
+            encoding='utf-8'
+        )
+        monkeypatch.setattr(connection.features, 'max_query_params', 2)
+        with CaptureQueriesContext(connection) as context:
+            import_csv(str(links), '--no-validate')
+        assert Title.genre.through.objects.count() == 5
+        assert len([
+            query for query in context.captured_queries
+            if 'FROM "reviews_title" WHERE' in query['sql']
+        ]) == 3, (
+            'Проверьте, что ссылки пачки сверяются запросами не длиннее '
+            'допустимого для СУБД числа параметров.'
+        )
+
+        links.write_text('id,title_id,genre_id\n6,1,2\n', encoding='utf-8')
+        with CaptureQueriesContext(connection) as context:
+            import_csv(str(links))
+        assert not any(
+            'FROM "reviews_title" WHERE' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что проверенные валидатором ссылки не сверяются '
+            'с базой повторно.'
+        )
+
+    @pytest.mark.parametrize('workers', ('1', '2'))
+    def test_12_unique_conflicts_rejected(self, tmp_path, workers):
+        import_csv()
+        genres = tmp_path / 'genre.csv'
+        genres.write_text(
+            'id,name,slug\n1,Драма,drama\n100,Ужасы,horror\n'
+            '101,Ещё драма,drama\n',
+            encoding='utf-8'
+        )
+        rejects = tmp_path / 'rejects'
+        output = import_csv(str(genres), '--workers', workers,
+                            '--rejects', str(rejects))
+        assert Genre.objects.filter(pk=100).exists()
+        assert not Genre.objects.filter(pk=101).exists()
+        assert 'отклонено 1' in output
+        lines = (rejects / 'genre.csv').read_text(
+            encoding='utf-8'
+        ).splitlines()
+        assert len(lines) == 2 and lines[1].startswith('101,'), (
+            'Проверьте, что строки, нарушающие ограничение уникальности, '
+            'попадают в файл отказов.'
+        )
+
+        genres.write_text(
+            'id,name,slug\n102,Снова драма,drama\n', encoding='utf-8'
+        )
+        with pytest.raises(CommandError, match='уникальности'):
+            import_csv(str(genres), '--no-validate')
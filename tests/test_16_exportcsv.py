@@ -0,0 +1,59 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from reviews.exporters import table_rows
+from reviews.importers import TABLES
+from reviews.models import Category, Genre, Title, User
+
+DATA_PATH = Path(__file__).resolve().parent.parent / 'api_yamdb/static/data'
+
+
+def run(command, *args):
+    call_command(command, *args, stdout=StringIO())
+
+
+def snapshot():
+    return {table.name: list(table_rows(table)) for table in TABLES}
+
+
+def clear_catalogue():
+    for model in (Title, Category, Genre, User):
+        model.objects.all().delete()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ExportCsv:
+
+    @pytest.mark.parametrize('args, extension', [
+        ((), '.csv.gz'),
+        (('--format', 'jsonl'), '.jsonl.gz'),
+        (('--format', 'jsonl', '--no-gzip'), '.jsonl'),
+    ])
+    def test_01_export_round_trip(self, tmp_path, args, extension):
+        run('importcsv', '--path', str(DATA_PATH))
+        expected = snapshot()
+        run('exportcsv', '--path', str(tmp_path), *args)
+        assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+            f'{table.name}{extension}' for table in TABLES
+        ), 'Проверьте, что `exportcsv` выгружает все таблицы каталога.'
+
+        clear_catalogue()
+        run('importcsv', '--path', str(tmp_path))
+        assert snapshot() == expected, (
+            'Проверьте, что выгрузка `exportcsv` загружается обратно '
+            '`importcsv` без потерь.'
+        )
+        clear_catalogue()
+        run('importcsv', '--path', str(tmp_path), '--workers', '2')
+        assert snapshot() == expected
+
+    def test_02_export_selected_tables(self, tmp_path):
+        run('importcsv', '--path', str(DATA_PATH))
+        run('exportcsv', '--path', str(tmp_path), '--no-gzip', 'genre')
+        assert [path.name for path in tmp_path.iterdir()] == ['genre.csv']
+        assert (tmp_path / 'genre.csv').read_text(
+            encoding='utf-8'
+        ).splitlines()[0] == 'id,name,slug'
@@ -0,0 +1,45 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from reviews.models import Review, Title
+from tests.fixtures.fixture_snapshot import DATA_PATH
+
+
+def run(*args):
+    call_command(*args, stdout=StringIO())
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17DbSnapshot:
+
+    def test_01_save_and_restore(self, tmp_path, client):
+        run('importcsv', '--path', str(DATA_PATH), '--checkpoint', '')
+        snapshot = tmp_path / 'db.sqlite3'
+        run('dbsnapshot', 'save', str(snapshot))
+        assert snapshot.exists()
+        titles = Title.objects.count()
+
+        Title.objects.all().delete()
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+        run('dbsnapshot', 'restore', str(snapshot))
+        assert Title.objects.count() == titles, (
+            'Проверьте, что `dbsnapshot restore` восстанавливает данные '
+            'из снимка.'
+        )
+        assert client.get('/api/v1/titles/').json()['count'] == titles, (
+            'Проверьте, что после восстановления снимка закэшированные '
+            'ответы каталога больше не отдаются.'
+        )
+        with pytest.raises(CommandError):
+            run('dbsnapshot', 'restore', str(tmp_path / 'missing.sqlite3'))
+
+    def test_02_snapshot_fixture(self, catalogue_snapshot, client):
+        response = client.get('/api/v1/titles/1/')
+        assert response.json()['name'] == 'Побег из Шоушенка', (
+            'Проверьте, что фикстура `catalogue_snapshot` восстанавливает '
+            'каталог из снимка.'
+        )
+        assert response.json()['rating'] is not None
+        assert Review.objects.exists()
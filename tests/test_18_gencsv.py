@@ -0,0 +1,88 @@
+import csv
+from collections import Counter
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment, Review, Title, User
+
+ARGS = ('--users', '50', '--titles', '40', '--reviews-per-title', '5',
+        '--comments-per-review', '0.5')
+
+
+def generate(path, *args):
+    call_command('gencsv', '--path', str(path), *ARGS, *args,
+                 stdout=StringIO())
+
+
+def read(path, name):
+    with open(path / f'{name}.csv', encoding='utf-8', newline='') as file:
+        return list(csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18GenCsv:
+
+    def test_01_deterministic(self, tmp_path):
+        generate(tmp_path / 'first', '--seed', '7')
+        generate(tmp_path / 'second', '--seed', '7')
+        generate(tmp_path / 'other', '--seed', '8')
+        names = sorted(path.name for path in (tmp_path / 'first').iterdir())
+        assert names == sorted(
+            f'{name}.csv' for name in (
+                'users', 'category', 'genre', 'titles', 'genre_title',
+                'review', 'comments'
+            )
+        ), 'Проверьте, что `gencsv` пишет файлы всех таблиц каталога.'
+        for name in names:
+            assert (tmp_path / 'first' / name).read_bytes() == (
+                tmp_path / 'second' / name
+            ).read_bytes(), (
+                'Проверьте, что при одном `--seed` `gencsv` '
+                'генерирует одинаковые данные.'
+            )
+        assert (tmp_path / 'first' / 'review.csv').read_bytes() != (
+            tmp_path / 'other' / 'review.csv'
+        ).read_bytes()
+
+    def test_02_reviews_distribution(self, tmp_path):
+        generate(tmp_path)
+        reviews = read(tmp_path, 'review')
+        assert abs(len(reviews) - 200) <= 40
+        pairs = Counter((row['title_id'], row['author']) for row in reviews)
+        assert max(pairs.values()) == 1, (
+            'Проверьте, что у произведения нет двух отзывов одного автора.'
+        )
+        per_title = Counter(row['title_id'] for row in reviews).most_common()
+        assert per_title[0][1] >= 5 * per_title[len(per_title) // 2][1], (
+            'Проверьте, что число отзывов на произведение распределено '
+            'по закону Ципфа.'
+        )
+
+    def test_03_import_generated(self, tmp_path):
+        generate(tmp_path, '--gzip')
+        call_command('importcsv', '--path', str(tmp_path),
+                     '--checkpoint', '', stdout=StringIO())
+        assert User.objects.count() == 50
+        assert Title.objects.count() == 40
+        assert Review.objects.count() == sum(
+            title.review_count for title in Title.objects.all()
+        ) > 0
+        assert Comment.objects.exists(), (
+            'Проверьте, что данные `gencsv` загружаются `importcsv`.'
+        )
+
+    def test_04_years_do_not_depend_on_clock(self, tmp_path):
+        generate(tmp_path / 'default')
+        generate(tmp_path / 'old', '--max-year', '1950')
+        years = [int(row['year']) for row in read(tmp_path / 'old', 'titles')]
+        assert 1900 <= min(years) and max(years) <= 1950, (
+            'Проверьте, что `gencsv --max-year` ограничивает год выпуска.'
+        )
+        assert max(
+            int(row['year']) for row in read(tmp_path / 'default', 'titles')
+        ) <= 2023, (
+            'Проверьте, что годы выпуска не зависят от текущей даты: '
+            'иначе тот же seed даст другие файлы в следующем году.'
+        )
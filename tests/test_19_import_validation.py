@@ -0,0 +1,155 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews import importers
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.validation import BatchValidator
+
+FILES = {
+    'users.csv': (
+        'id,username,email,role\n'
+        '1,reader,reader@yamdb.fake,user\n'
+        '2,me,me@yamdb.fake,user\n'
+        '3,critic,critic@yamdb.fake,king\n'
+    ),
+    'category.csv': 'id,name,slug\n1,Фильмы,movie\n2,Книги,кни ги\n',
+    'genre.csv': 'id,name,slug\n1,Драма,drama\n',
+    'titles.csv': (
+        'id,name,year,category\n'
+        '1,Побег из Шоушенка,1994,1\n'
+        '2,Из будущего,3000,1\n'
+        '3,Без категории,2000,2\n'
+    ),
+    'genre_title.csv': 'id,title_id,genre_id\n1,1,1\n2,2,1\n',
+    'review.csv': (
+        'id,title_id,text,author,score,pub_date\n'
+        '1,1,Отлично,1,10,2019-09-24T21:08:21.567Z\n'
+        '2,1,Слишком,1,11,2019-09-24T21:08:21.567Z\n'
+        '3,2,Будущее,1,5,2019-09-24T21:08:21.567Z\n'
+        '4,1,Самозванец,2,5,2019-09-24T21:08:21.567Z\n'
+    ),
+    'comments.csv': (
+        'id,review_id,text,author,pub_date\n'
+        '1,1,Согласен,1,2019-09-25T21:08:21.567Z\n'
+        '2,2,Не согласен,1,2019-09-25T21:08:21.567Z\n'
+    ),
+}
+
+
+def write_files(path):
+    for name, content in FILES.items():
+        (path / name).write_text(content, encoding='utf-8')
+
+
+def import_csv(path, *args):
+    out = StringIO()
+    call_command(
+        'importcsv', '--path', str(path), '--checkpoint', '',
+        '--rejects', str(path / 'rejects'), *args, stdout=out
+    )
+    return out.getvalue()
+
+
+def read_rejects(path, table):
+    with open(path / 'rejects' / f'{table}.csv', encoding='utf-8',
+              newline='') as file:
+        return {
+            row['id']: row['reject_reason'] for row in csv.DictReader(file)
+        }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ImportValidation:
+
+    @pytest.mark.parametrize('workers', ['1', '2'])
+    def test_01_rejects_bad_rows(self, tmp_path, workers):
+        write_files(tmp_path)
+        output = import_csv(tmp_path, '--workers', workers)
+        assert list(User.objects.values_list('pk', flat=True)) == [1]
+        assert list(Category.objects.values_list('pk', flat=True)) == [1]
+        assert Genre.objects.count() == 1
+        assert sorted(Title.objects.values_list('pk', flat=True)) == [1], (
+            'Проверьте, что строки с ошибками пропускаются, а загрузка '
+            'продолжается.'
+        )
+        assert list(Review.objects.values_list('pk', flat=True)) == [1]
+        assert list(Comment.objects.values_list('pk', flat=True)) == [1]
+
+        assert set(read_rejects(tmp_path, 'users')) == {'2', '3'}
+        assert 'slug' in read_rejects(tmp_path, 'category')['2']
+        titles = read_rejects(tmp_path, 'titles')
+        assert titles['2'].startswith('year:')
+        assert titles['3'].startswith('category:')
+        reviews = read_rejects(tmp_path, 'review')
+        assert reviews['2'].startswith('score:'), (
+            'Проверьте, что строки с ошибками попадают в файл отказов '
+            'вместе с причиной.'
+        )
+        assert reviews['3'].startswith('title:')
+        assert reviews['4'].startswith('author:')
+        assert set(read_rejects(tmp_path, 'comments')) == {'2'}
+        assert set(read_rejects(tmp_path, 'genre_title')) == {'2'}
+        assert 'отклонено 3' in output
+
+    def test_02_links_checked_without_row_queries(self, tmp_path):
+        write_files(tmp_path)
+        import_csv(tmp_path, 'users=' + str(tmp_path / 'users.csv'),
+                   'titles=' + str(tmp_path / 'titles.csv'),
+                   'category=' + str(tmp_path / 'category.csv'))
+        reviews = ['id,title_id,text,author,score,pub_date']
+        reviews += [
+            f'{index},{index % 5},Текст,{index},5,2019-09-24T21:08:21.567Z'
+            for index in range(1, 201)
+        ]
+        (tmp_path / 'review.csv').write_text(
+            '\n'.join(reviews) + '\n', encoding='utf-8'
+        )
+        with CaptureQueriesContext(connection) as context:
+            import_csv(tmp_path, str(tmp_path / 'review.csv'),
+                       '--batch-size', '50')
+        assert len(read_rejects(tmp_path, 'review')) == 199
+        assert Review.objects.count() == 1
+        lookups = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_title"' in query['sql']
+            and 'reviews_review' not in query['sql']
+        ]
+        assert len(lookups) == 1, (
+            'Проверьте, что внешние ключи сверяются с id, прочитанными '
+            'один раз, а не запросом на каждую строку.'
+        )
+
+    def test_03_chunks_checked_in_workers(self, tmp_path, monkeypatch):
+        write_files(tmp_path)
+        import_csv(tmp_path, 'users=' + str(tmp_path / 'users.csv'),
+                   'titles=' + str(tmp_path / 'titles.csv'),
+                   'category=' + str(tmp_path / 'category.csv'))
+        review = next(
+            table for table in importers.TABLES if table.name == 'review'
+        )
+        ids = BatchValidator().level_ids([review])
+        monkeypatch.setattr(
+            importers, 'worker_validator', BatchValidator(ids=ids)
+        )
+        path = tmp_path / 'review.csv'
+        header, start = importers.read_header(path)
+        with CaptureQueriesContext(connection) as context:
+            values, rejects, total = importers.parse_chunk(
+                'review', header, path, start, path.stat().st_size
+            )
+        assert not context.captured_queries, (
+            'Проверьте, что процессы пула проверяют строки по переданным '
+            'битовым картам id, без запросов к базе.'
+        )
+        assert total == 4
+        assert [value[0] for value in values] == [1], (
+            'Проверьте, что процессы пула отбрасывают ошибочные строки '
+            'и преобразуют остальные.'
+        )
+        assert sorted(row[0] for row, _ in rejects) == ['2', '3', '4']
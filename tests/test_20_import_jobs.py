@@ -0,0 +1,183 @@
+from http import HTTPStatus
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from reviews import importers, jobs
+from reviews.models import ImportJob, Title
+
+DATA_PATH = Path(__file__).resolve().parent.parent / 'api_yamdb/static/data'
+URL = '/api/v1/imports/'
+
+
+def data_files(**replace):
+    files = {
+        path.stem: SimpleUploadedFile(path.name, path.read_bytes())
+        for path in DATA_PATH.iterdir()
+    }
+    for table, content in replace.items():
+        files[table] = SimpleUploadedFile(
+            f'{table}.csv', content.encode('utf-8')
+        )
+    return files
+
+
+@pytest.fixture
+def jobs_root(settings, tmp_path):
+    settings.IMPORT_JOBS_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def run_worker():
+    """Один проход обработчика очереди задач."""
+    out = StringIO()
+    err = StringIO()
+    call_command('runimportjob', stdout=out, stderr=err)
+    return out.getvalue(), err.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20ImportJobs:
+
+    def test_01_admin_only(self, client, user_client, jobs_root):
+        assert client.post(URL, data_files()).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.post(URL, data_files()).status_code == (
+            HTTPStatus.FORBIDDEN
+        ), 'Проверьте, что загружать CSV может только администратор.'
+        assert not ImportJob.objects.exists()
+
+    def test_02_upload_and_status(self, admin_client, jobs_root):
+        bad_title = (DATA_PATH / 'titles.csv').read_text(
+            encoding='utf-8'
+        ).rstrip('\n') + '\n9999,Из будущего,3000,1\n'
+        response = admin_client.post(URL, data_files(titles=bad_title))
+        assert response.status_code == HTTPStatus.ACCEPTED, (
+            'Проверьте, что загрузка CSV возвращает 202 и id задачи.'
+        )
+        job_id = response.json()['id']
+        output, _ = run_worker()
+        assert f'Задача {job_id} выполнена' in output
+        assert not (jobs_root / str(job_id) / 'review.csv').exists(), (
+            'Проверьте, что загруженные файлы удаляются после загрузки.'
+        )
+
+        status = admin_client.get(f'{URL}{job_id}/').json()
+        assert status['status'] == ImportJob.DONE, (
+            'Проверьте, что состояние задачи доступно по её id.'
+        )
+        assert status['rejected'] == 1
+        assert status['tables']['titles']['rejected'] == 1
+        assert status['rows'] == sum(
+            table['rows'] for table in status['tables'].values()
+        ) > 0
+        assert status['rows_per_second'] > 0
+        assert Title.objects.count() == status['tables']['titles']['rows'] - 1
+        assert (jobs_root / str(job_id) / 'rejects' / 'titles.csv').exists()
+
+    def test_03_rejects_unknown_files(self, admin_client, jobs_root):
+        response = admin_client.post(URL, {
+            'movies': SimpleUploadedFile('movies.csv', b'id\n1\n'),
+            'genre': SimpleUploadedFile('genre.txt', b'id\n1\n'),
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert set(response.json()) == {'movies', 'genre'}
+        assert admin_client.post(URL, {}).status_code == (
+            HTTPStatus.BAD_REQUEST
+        )
+        assert not ImportJob.objects.exists()
+
+    def test_04_worker_runs_queue(self, admin, admin_client, jobs_root):
+        response = admin_client.post(URL, data_files())
+        assert response.json()['status'] == ImportJob.PENDING
+        first = response.json()['id']
+        assert ImportJob.objects.get(pk=first).status == ImportJob.PENDING, (
+            'Проверьте, что загрузка только ставит задачу в очередь.'
+        )
+        broken = ImportJob.objects.create(author=admin)
+        jobs.save_upload(broken.pk, 'genre', SimpleUploadedFile(
+            'genre.csv.gz', b'id,name,slug\n1,Drama,drama\n'
+        ))
+        last = admin_client.post(URL, {
+            'genre': SimpleUploadedFile('genre.csv', b'id,name,slug\n'),
+        }).json()['id']
+
+        output, errors = run_worker()
+        statuses = dict(ImportJob.objects.values_list('pk', 'status'))
+        assert statuses == {
+            first: ImportJob.DONE,
+            broken.pk: ImportJob.FAILED,
+            last: ImportJob.DONE,
+        }, (
+            'Проверьте, что `runimportjob` выполняет все ожидающие задачи, '
+            'и ошибка одной из них не останавливает очередь.'
+        )
+        assert f'Задача {broken.pk}' in errors
+        assert output.index(f'Задача {first} ') < output.index(
+            f'Задача {last} '
+        )
+
+    def test_05_job_runs_once(self, admin, jobs_root, monkeypatch):
+        job = ImportJob.objects.create(author=admin)
+        jobs.save_upload(job.pk, 'genre', SimpleUploadedFile(
+            'genre.csv', b'id,name,slug\n1,Drama,drama\n'
+        ))
+
+        def no_fast_load(*args, **kwargs):
+            raise AssertionError('Прагмы быстрой загрузки включены.')
+
+        monkeypatch.setattr(importers, 'fast_load', no_fast_load)
+        assert jobs.run_import_job(job.pk) is True, (
+            'Проверьте, что фоновая загрузка не меняет прагмы SQLite '
+            'базы работающего сайта.'
+        )
+        assert jobs.run_import_job(job.pk) is False, (
+            'Проверьте, что задачу можно запустить только один раз.'
+        )
+        with pytest.raises(CommandError):
+            call_command('runimportjob', str(job.pk))
+        assert ImportJob.objects.get(pk=job.pk).status == ImportJob.DONE
+
+    def test_06_stale_jobs_fail(self, admin, admin_client, jobs_root):
+        stale = timezone.now() - 2 * jobs.STALE_AFTER
+        job = ImportJob.objects.create(
+            author=admin, status=ImportJob.RUNNING, started=stale,
+            heartbeat=stale
+        )
+        alive = ImportJob.objects.create(
+            author=admin, status=ImportJob.RUNNING,
+            started=stale, heartbeat=timezone.now()
+        )
+        assert admin_client.get(f'{URL}{job.pk}/').json()['status'] == (
+            ImportJob.RUNNING
+        ), 'Проверьте, что GET-запрос к задаче ничего не пишет в базу.'
+        run_worker()
+        assert admin_client.get(f'{URL}{job.pk}/').json()['status'] == (
+            ImportJob.FAILED
+        ), (
+            'Проверьте, что задача, процесс которой перестал подавать '
+            'сигнал, помечается failed.'
+        )
+        assert ImportJob.objects.get(pk=alive.pk).status == ImportJob.RUNNING
+
+    def test_07_old_job_files_pruned(self, admin, jobs_root):
+        old = ImportJob.objects.create(
+            author=admin, status=ImportJob.DONE,
+            finished=timezone.now() - settings.IMPORT_JOBS_RETENTION * 2
+        )
+        (jobs_root / str(old.pk) / 'rejects').mkdir(parents=True)
+        job = ImportJob.objects.create(author=admin)
+        jobs.save_upload(job.pk, 'genre', SimpleUploadedFile(
+            'genre.csv', b'id,name,slug\n1,Drama,drama\n'
+        ))
+        jobs.run_import_job(job.pk)
+        assert not (jobs_root / str(old.pk)).exists(), (
+            'Проверьте, что каталоги старых задач удаляются.'
+        )
+        assert (jobs_root / str(job.pk)).exists()
@@ -0,0 +1,143 @@
+import smtplib
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.utils import timezone
+
+from tests.utils import send_outbox
+from users.models import EmailOutbox
+from users.outbox import send_batch
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+
+
+def signup(client, count):
+    for index in range(count):
+        response = client.post(SIGNUP_URL, data={
+            'email': f'user{index}@yamdb.fake',
+            'username': f'user{index}',
+        })
+        assert response.status_code == HTTPStatus.OK
+
+
+class FailingBackend(EmailBackend):
+
+    def send_messages(self, messages):
+        raise smtplib.SMTPServerDisconnected('Сервер недоступен')
+
+
+class CrashingBackend(EmailBackend):
+    """Отправляет первое письмо и падает на втором."""
+
+    def send_messages(self, messages):
+        if mail.outbox:
+            raise RuntimeError('Процесс упал')
+        return super().send_messages(messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21EmailOutbox:
+
+    def test_01_signup_queues_email(self, client):
+        signup(client, 1)
+        assert not mail.outbox, (
+            'Проверьте, что регистрация не отправляет письмо в запросе, '
+            'а ставит его в очередь.'
+        )
+        message = EmailOutbox.objects.get()
+        assert message.recipient == 'user0@yamdb.fake'
+        assert message.sent is None
+
+    def test_02_file_backend_single_connection(self, client, settings,
+                                               tmp_path):
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.filebased.EmailBackend'
+        )
+        settings.EMAIL_FILE_PATH = str(tmp_path)
+        signup(client, 3)
+        send_outbox()
+        files = list(tmp_path.iterdir())
+        assert len(files) == 1, (
+            'Проверьте, что `sendoutbox` отправляет пачку писем через одно '
+            'соединение с почтовым сервером.'
+        )
+        content = files[0].read_text(encoding='utf-8')
+        assert all(f'user{index}@yamdb.fake' in content for index in range(3))
+        assert not EmailOutbox.objects.filter(sent__isnull=True).exists()
+        send_outbox()
+        assert len(list(tmp_path.iterdir())) == 1, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_03_retry_with_backoff(self, client, settings):
+        settings.EMAIL_BACKEND = f'{__name__}.FailingBackend'
+        settings.OUTBOX_MAX_ATTEMPTS = 2
+        signup(client, 1)
+        send_outbox()
+        message = EmailOutbox.objects.get()
+        assert message.attempts == 1 and 'недоступен' in message.error
+        assert message.send_after > timezone.now(), (
+            'Проверьте, что неудачная отправка откладывается.'
+        )
+        send_outbox()
+        assert EmailOutbox.objects.get().attempts == 1
+
+        EmailOutbox.objects.update(send_after=timezone.now())
+        send_outbox()
+        message = EmailOutbox.objects.get()
+        assert message.attempts == 2
+        assert message.send_after - timezone.now() > timedelta(
+            seconds=settings.OUTBOX_RETRY_DELAY * 1.5
+        ), 'Проверьте, что задержка растёт с каждой попыткой.'
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        EmailOutbox.objects.update(send_after=timezone.now())
+        send_outbox()
+        assert not mail.outbox, (
+            'Проверьте, что после OUTBOX_MAX_ATTEMPTS попыток письмо '
+            'больше не отправляется.'
+        )
+
+    def test_04_stats(self, client, admin_client):
+        signup(client, 2)
+        stats = admin_client.get('/api/v1/stats/').json()['email_outbox']
+        assert stats['pending'] == 2, (
+            'Проверьте, что `/api/v1/stats/` показывает глубину очереди писем.'
+        )
+        assert stats['oldest_pending_seconds'] >= 0
+        send_outbox()
+        stats = admin_client.get('/api/v1/stats/').json()['email_outbox']
+        assert stats['pending'] == 0 and stats['failed'] == 0
+        assert stats['avg_delivery_seconds'] >= 0
+        assert stats['max_delivery_seconds'] >= stats['avg_delivery_seconds']
+
+    def test_05_claimed_messages_sent_once(self, client, settings):
+        settings.EMAIL_BACKEND = f'{__name__}.CrashingBackend'
+        signup(client, 3)
+        with pytest.raises(RuntimeError):
+            send_batch()
+        assert len(mail.outbox) == 1
+        first = EmailOutbox.objects.get(recipient=mail.outbox[0].to[0])
+        assert first.sent is not None and first.body == '', (
+            'Проверьте, что письмо отмечается отправленным сразу после '
+            'отправки, а текст с кодом подтверждения стирается.'
+        )
+        assert send_batch() == (0, 0), (
+            'Проверьте, что письма, забранные другим процессом, '
+            'не отправляются повторно до истечения срока.'
+        )
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        EmailOutbox.objects.update(send_after=timezone.now())
+        assert send_batch() == (2, 0)
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'user{index}@yamdb.fake' for index in range(3)
+        ], 'Проверьте, что после падения процесса письма не дублируются.'
+        assert not EmailOutbox.objects.exclude(body='').exists()
@@ -0,0 +1,114 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.admin.sites import site
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from users.models import User
+
+ME_URL = '/api/v1/users/me/'
+
+
+def user_queries(context):
+    return [
+        query for query in context.captured_queries
+        if 'FROM "users_user"' in query['sql']
+    ]
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(settings, tmp_path):
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(tmp_path / 'cache'),
+    }}
+    settings.USER_CACHE_TIMEOUT = 60
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22UserCache:
+
+    def test_01_no_user_query_when_cached(self, user_client, user):
+        assert user_client.get(ME_URL).status_code == HTTPStatus.OK
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(ME_URL)
+        assert response.json()['username'] == user.username
+        assert not context.captured_queries, (
+            'Проверьте, что аутентифицированный запрос к `users/me/` '
+            'берёт пользователя из кэша, без запросов к базе.'
+        )
+
+    def test_02_invalidated_on_patch(self, admin_client, user_client, user):
+        assert user_client.get('/api/v1/users/').status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get('/api/v1/users/').status_code == (
+            HTTPStatus.OK
+        ), (
+            'Проверьте, что смена роли через API сбрасывает кэш '
+            'пользователя.'
+        )
+        user_client.patch(ME_URL, data={'bio': 'Новое'})
+        with CaptureQueriesContext(connection) as context:
+            assert user_client.get(ME_URL).json()['bio'] == 'Новое'
+        assert len(user_queries(context)) == 1
+
+    def test_03_invalidated_on_admin_and_delete(self, user_client, user,
+                                                user_superuser):
+        user_client.get(ME_URL)
+        model_admin = site._registry[User]
+        request = RequestFactory().post('/admin/users/user/')
+        request.user = user_superuser
+        form = model_admin.get_changelist_formset(request)(
+            data={
+                'form-TOTAL_FORMS': '1', 'form-INITIAL_FORMS': '1',
+                'form-0-id': str(user.pk), 'form-0-role': 'moderator',
+            },
+            queryset=User.objects.filter(pk=user.pk)
+        )
+        assert form.is_valid(), form.errors
+        for instance in form.save(commit=False):
+            model_admin.save_model(request, instance, None, change=True)
+        assert user_client.get(ME_URL).json()['role'] == 'moderator', (
+            'Проверьте, что смена роли в админке сбрасывает кэш '
+            'пользователя.'
+        )
+        user.delete()
+        assert user_client.get(ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что удалённый пользователь не остаётся в кэше.'
+
+    def test_04_no_password_in_cache(self, user_client, user):
+        from django.core.cache import cache
+
+        from users.cache import user_cache_key
+
+        user_client.get(ME_URL)
+        cached = cache.get(user_cache_key(user.pk))
+        assert cached is not None
+        assert 'password' not in cached and user.password not in (
+            cached.values()
+        ), 'Проверьте, что хеш пароля не попадает в кэш пользователей.'
+        user_client.patch(ME_URL, data={'bio': 'Новое'})
+        assert User.objects.get(pk=user.pk).password == user.password, (
+            'Проверьте, что сохранение пользователя из кэша не затирает '
+            'поля, которых в кэше нет.'
+        )
+
+    def test_05_no_cache_in_process_memory(self, settings, user_client):
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        user_client.get(ME_URL)
+        with CaptureQueriesContext(connection) as context:
+            assert user_client.get(ME_URL).status_code == HTTPStatus.OK
+        assert len(user_queries(context)) == 1, (
+            'Проверьте, что с кэшем в памяти процесса пользователи не '
+            'кэшируются: сброс не дошёл бы до других процессов.'
+        )
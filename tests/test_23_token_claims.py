@@ -0,0 +1,133 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import Category, Title
+
+TOKEN_URL = '/api/v1/auth/token/'
+STATS_URL = '/api/v1/stats/'
+
+
+def token_client(client, user):
+    response = client.post(TOKEN_URL, data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == HTTPStatus.OK
+    token = response.json()['token']
+    api_client = APIClient()
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return api_client, AccessToken(token)
+
+
+def user_queries(context):
+    return [
+        query for query in context.captured_queries
+        if '"users_user"' in query['sql']
+    ]
+
+
+@pytest.fixture
+def token_user_mode(settings):
+    settings.JWT_TOKEN_USER = True
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TokenClaims:
+
+    def test_01_token_has_role_claims(self, client, admin):
+        _, token = token_client(client, admin)
+        assert token['role'] == 'admin', (
+            'Проверьте, что токен доступа содержит роль пользователя.'
+        )
+        assert token['is_superuser'] is False
+        assert token['token_version'] == admin.token_version
+
+    def test_02_permissions_without_user_query(self, client, admin,
+                                               token_user_mode):
+        admin_client, _ = token_client(client, admin)
+        assert admin_client.get(STATS_URL).status_code == HTTPStatus.OK
+        with CaptureQueriesContext(connection) as context:
+            assert admin_client.get(STATS_URL).status_code == HTTPStatus.OK
+        assert not user_queries(context), (
+            'Проверьте, что в режиме JWT_TOKEN_USER права проверяются '
+            'по роли из токена, без запроса пользователя.'
+        )
+
+    def test_03_role_downgrade_revokes_token(self, client, admin,
+                                             user_superuser_client,
+                                             token_user_mode):
+        admin_client, _ = token_client(client, admin)
+        assert admin_client.get(STATS_URL).status_code == HTTPStatus.OK
+        response = user_superuser_client.patch(
+            f'/api/v1/users/{admin.username}/', data={'role': 'user'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert admin_client.get(STATS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что после смены роли выданные токены сразу '
+            'перестают действовать.'
+        )
+        admin.refresh_from_db()
+        admin_client, token = token_client(client, admin)
+        assert token['role'] == 'user'
+        assert admin_client.get(STATS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+
+    def test_04_writes_with_token_user(self, client, user, token_user_mode):
+        category = Category.objects.create(name='Фильмы', slug='films')
+        title = Title.objects.create(name='Фильм', year=2000,
+                                     category=category)
+        user_client, _ = token_client(client, user)
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        response = user_client.post(url, data={'text': 'Текст', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что в режиме JWT_TOKEN_USER автором отзыва '
+            'становится пользователь из токена.'
+        )
+        assert response.json()['author'] == user.username
+        review_url = f'{url}{response.json()["id"]}/'
+        assert user_client.patch(
+            review_url, data={'text': 'Правка'}
+        ).status_code == HTTPStatus.OK
+        assert user_client.get('/api/v1/users/me/').json()['username'] == (
+            user.username
+        )
+
+    def test_05_token_user_requires_shared_cache(self, settings):
+        from api.checks import check_token_user_cache
+
+        settings.JWT_TOKEN_USER = True
+        assert [error.id for error in check_token_user_cache(None)] == [
+            'api.E001'
+        ], (
+            'Проверьте, что режим JWT_TOKEN_USER с кэшем в памяти процесса '
+            'не проходит проверку: отзыв токенов не дойдёт до других '
+            'процессов.'
+        )
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'cache',
+        }}
+        assert check_token_user_cache(None) == []
+        settings.USER_CACHE_TIMEOUT = 60
+        assert check_token_user_cache(None) == []
+        settings.JWT_TOKEN_USER = False
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}
+        assert [error.id for error in check_token_user_cache(None)] == [
+            'api.E001'
+        ], (
+            'Проверьте, что кэш пользователей в памяти процесса не '
+            'проходит проверку.'
+        )
+        settings.USER_CACHE_TIMEOUT = 0
+        assert check_token_user_cache(None) == []
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.v1 import authentication
+from api.v1.authentication import TokenCache, token_cache
+
+ME_URL = '/api/v1/users/me/'
+
+
+def client_for(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.fixture
+def empty_token_cache():
+    token_cache.clear()
+    yield token_cache
+    token_cache.clear()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24TokenCache:
+
+    def test_01_repeated_token_is_not_decoded(self, user, empty_token_cache,
+                                              monkeypatch):
+        client = client_for(AccessToken.for_user(user))
+        assert client.get(ME_URL).status_code == HTTPStatus.OK
+
+        def fail(*args, **kwargs):
+            raise AssertionError('Токен проверен повторно.')
+
+        monkeypatch.setattr(AccessToken, '__init__', fail)
+        for _ in range(3):
+            assert client.get(ME_URL).status_code == HTTPStatus.OK, (
+                'Проверьте, что проверенный токен берётся из кэша без '
+                'повторного декодирования и проверки подписи.'
+            )
+        stats = empty_token_cache.stats()
+        assert (stats['hits'], stats['misses']) == (3, 1)
+        assert stats['hit_rate'] == 0.75
+
+    def test_02_tampered_token_is_rejected(self, user, empty_token_cache):
+        token = str(AccessToken.for_user(user))
+        assert client_for(token).get(ME_URL).status_code == HTTPStatus.OK
+        tampered = token[:-2] + ('AA' if token[-2:] != 'AA' else 'BB')
+        assert client_for(tampered).get(ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что кэш не принимает токен с другой подписью.'
+
+    def test_03_expired_token_leaves_cache(self, user, empty_token_cache,
+                                           monkeypatch):
+        token = AccessToken.for_user(user)
+        client = client_for(token)
+        assert client.get(ME_URL).status_code == HTTPStatus.OK
+        assert empty_token_cache.stats()['size'] == 1
+        expires = token['exp']
+        monkeypatch.setattr(authentication.time, 'time', lambda: expires)
+        assert empty_token_cache.get(TokenCache.key(str(token))) is None, (
+            'Проверьте, что токен хранится в кэше только до exp.'
+        )
+        assert empty_token_cache.stats()['size'] == 0
+
+    def test_04_cache_is_bounded(self, user, admin):
+        cache = TokenCache(2)
+        tokens = [
+            str(AccessToken.for_user(owner)) for owner in (user, admin, user)
+        ]
+        for token in tokens:
+            cache.validate(token, AccessToken)
+        assert cache.stats()['size'] == 2, (
+            'Проверьте, что размер кэша токенов ограничен.'
+        )
+        assert cache.get(TokenCache.key(tokens[0])) is None
+        assert cache.get(TokenCache.key(tokens[2])) is not None
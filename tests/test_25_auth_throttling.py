@@ -0,0 +1,123 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.v1 import throttles
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+
+
+def signup(client, username, ip='10.0.0.1'):
+    return client.post(SIGNUP_URL, data={
+        'username': username, 'email': f'{username}@yamdb.fake'
+    }, REMOTE_ADDR=ip)
+
+
+@pytest.fixture
+def rates(settings):
+    settings.AUTH_THROTTLE_RATES = {
+        'signup': {'ip': '5/min', 'username': '2/min'},
+        'token': {'ip': '3/min'},
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25AuthThrottling:
+
+    def test_01_username_bucket(self, client, rates):
+        for _ in range(2):
+            assert signup(client, 'burst').status_code == HTTPStatus.OK
+        response = signup(client, 'burst')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что частые регистрации одного username '
+            'отклоняются со статусом 429.'
+        )
+        assert 0 < int(response['Retry-After']) <= 60, (
+            'Проверьте, что ответ 429 содержит заголовок Retry-After '
+            'со временем до начала следующего окна.'
+        )
+        assert signup(client, 'other').status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит по username не затрагивает '
+            'других пользователей.'
+        )
+
+    def test_02_ip_bucket(self, client, rates):
+        for idx in range(5):
+            assert signup(client, f'user{idx}').status_code == HTTPStatus.OK
+        assert signup(client, 'user5').status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        ), 'Проверьте, что частые запросы с одного IP отклоняются.'
+        assert signup(client, 'user5', ip='10.0.0.2').status_code == (
+            HTTPStatus.OK
+        )
+
+    def test_03_window_resets(self, client, rates, monkeypatch):
+        now = throttles.time.time() // 60 * 60 + 15
+        monkeypatch.setattr(throttles.time, 'time', lambda: now)
+        for _ in range(2):
+            signup(client, 'burst')
+        response = signup(client, 'burst')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        assert response['Retry-After'] == '45'
+        monkeypatch.setattr(throttles.time, 'time', lambda: now + 45)
+        assert signup(client, 'burst').status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит снова доступен в следующем окне.'
+        )
+        assert signup(client, 'burst').status_code == HTTPStatus.OK
+        assert signup(client, 'burst').status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+
+    def test_04_limits_per_view(self, client, rates):
+        for _ in range(3):
+            assert client.post(
+                TOKEN_URL, data={'username': 'nobody'}
+            ).status_code == HTTPStatus.BAD_REQUEST
+        assert client.post(
+            TOKEN_URL, data={'username': 'nobody'}
+        ).status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что для получения токена действует свой лимит.'
+        )
+        assert signup(client, 'fresh').status_code == HTTPStatus.OK
+
+    def test_05_stats(self, client, admin_client, rates):
+        for _ in range(3):
+            signup(client, 'burst')
+        stats = admin_client.get('/api/v1/stats/').json()['throttling']
+        assert stats['signup']['username'] == {
+            'allowed': 2, 'throttled': 1
+        }, 'Проверьте счётчики ограничения частоты в `/api/v1/stats/`.'
+        assert stats['signup']['ip'] == {'allowed': 3, 'throttled': 0}
+        assert stats['token']['ip'] == {'allowed': 0, 'throttled': 0}
+
+    def test_06_concurrent_requests_counted(self, rates):
+        from concurrent.futures import ThreadPoolExecutor
+
+        from django.core.cache import cache
+
+        key = 'throttle:test:concurrent'
+        with ThreadPoolExecutor(8) as pool:
+            counts = sorted(pool.map(
+                lambda _: throttles.hit(key, 60), range(40)
+            ))
+        assert counts == list(range(1, 41)), (
+            'Проверьте, что счётчик лимита увеличивается атомарно и '
+            'параллельные запросы не теряются.'
+        )
+        cache.delete(key)
+
+    def test_07_shared_cache_check(self, settings):
+        from api.checks import check_throttle_cache
+
+        assert [
+            warning.id for warning in check_throttle_cache(None)
+        ] == ['api.W001'], (
+            'Проверьте, что лимиты на кэше в памяти процесса вызывают '
+            'предупреждение проверки.'
+        )
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'cache',
+        }}
+        assert check_throttle_cache(None) == []
@@ -1,4 +1,7 @@
 from http import HTTPStatus
+from io import StringIO
+
+from django.core.management import call_command
 
 
 check_name_and_slug_patterns = (
@@ -305,3 +308,8 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def send_outbox():
+    """Отправляет письма из очереди, как фоновая команда sendoutbox."""
+    call_command('sendoutbox', stdout=StringIO())